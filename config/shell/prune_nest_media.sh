@@ -0,0 +1,43 @@
+#!/bin/sh
+# shell/prune_nest_media.sh: Evict the oldest nest event media
+#
+# Usage: prune_nest_media.sh <media path> <max files> <max bytes>
+#
+# The nest integration keeps media for the most recent events of each device,
+# but places no limit on the disk space used. This removes the oldest files
+# until both the file count and the total size are within the budget. Media
+# files are named `<device>/<timestamp>-<event type>.<ext>` so sorting by file
+# name orders them oldest first across all devices.
+
+set -eu
+
+media_path="$1"
+max_files="${2:-}"
+max_bytes="${3:-}"
+
+# A zero or missing budget would evict all media, so refuse it
+case "${max_files}" in
+  '' | *[!0-9]* | 0) echo "Invalid max files: '${max_files}'" >&2; exit 1 ;;
+esac
+case "${max_bytes}" in
+  '' | *[!0-9]* | 0) echo "Invalid max bytes: '${max_bytes}'" >&2; exit 1 ;;
+esac
+
+if [ ! -d "${media_path}" ]; then
+  exit 0
+fi
+
+find "${media_path}" -type f -exec wc -c {} + |
+  awk '$2 != "total" { n = split($2, parts, "/"); print parts[n] "\t" $1 "\t" $2 }' |
+  sort |
+  awk -F '\t' -v max_files="${max_files}" -v max_bytes="${max_bytes}" '
+    { path[NR] = $3; size[NR] = $2; total += $2 }
+    END {
+      count = NR
+      for (i = 1; i <= NR && (count > max_files || total > max_bytes); i++) {
+        print path[i]
+        count--
+        total -= size[i]
+      }
+    }' |
+  xargs -r rm -f
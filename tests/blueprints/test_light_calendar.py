@@ -0,0 +1,278 @@
+"""Tests for the evening light calendar automations."""
+
+import datetime
+import logging
+from typing import Any
+from unittest.mock import patch
+
+import pytest
+from freezegun import freeze_time
+from homeassistant.components.automation import AutomationEntity
+from homeassistant.components.calendar import DATA_COMPONENT
+from homeassistant.const import EVENT_CALL_SERVICE, SUN_EVENT_SUNSET
+from homeassistant.core import HomeAssistant, ServiceCall
+from homeassistant.helpers.sun import get_astral_event_next
+from homeassistant.setup import async_setup_component
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import (
+    async_capture_events,
+    async_fire_time_changed,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+
+CALENDAR_ENTITY = "calendar.personal"
+LIGHT_ENTITY = "light.porch"
+CLOCK_STEP = datetime.timedelta(minutes=1)
+# Short events during the day that should never turn on the light
+DAYTIME_EVENTS = 8
+
+
+def calendar_automation() -> list[dict[str, Any]]:
+    """Return the automation that reacts to calendar changes and sunset."""
+    return [
+        {
+            "id": "light-calendar",
+            "alias": "Light Calendar",
+            "use_blueprint": {
+                "path": "allenporter/light_calendar.yaml",
+                "input": {
+                    "calendar_sensor": CALENDAR_ENTITY,
+                    "target_light": {"entity_id": LIGHT_ENTITY},
+                },
+            },
+        }
+    ]
+
+
+def schedule_automation() -> list[dict[str, Any]]:
+    """Return the automation that waits for the next computed on time."""
+    return [
+        {
+            "id": "light-calendar-schedule",
+            "alias": "Light Calendar Schedule",
+            "use_blueprint": {
+                "path": "allenporter/light_calendar_schedule.yaml",
+                "input": {
+                    "calendar_entity": CALENDAR_ENTITY,
+                    "target_light": {"entity_id": LIGHT_ENTITY},
+                },
+            },
+        }
+    ]
+
+
+class LightLog:
+    """Light services that record the simulated time of each call."""
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize LightLog."""
+        self.calls: list[tuple[str, datetime.datetime]] = []
+        for service in ("turn_on", "turn_off"):
+            hass.services.async_register("light", service, self.async_handle)
+
+    async def async_handle(self, call: ServiceCall) -> None:
+        """Handle a light service call."""
+        self.calls.append((call.service, dt_util.now()))
+
+
+async def create_event(
+    hass: HomeAssistant, start: datetime.datetime, end: datetime.datetime
+) -> None:
+    """Create an event on the calendar."""
+    await hass.services.async_call(
+        "calendar",
+        "create_event",
+        {
+            "entity_id": CALENDAR_ENTITY,
+            "summary": "Lights",
+            "start_date_time": start.isoformat(),
+            "end_date_time": end.isoformat(),
+        },
+        blocking=True,
+    )
+
+
+@pytest.mark.parametrize(("expected_lingering_timers"), [True])
+@pytest.mark.parametrize(
+    ("name", "automations"),
+    [
+        ("calendar", calendar_automation),
+        ("schedule", schedule_automation),
+    ],
+)
+async def test_light_calendar_simulated_day(
+    hass: HomeAssistant,
+    calendar: Any,
+    error_caplog: pytest.LogCaptureFixture,
+    name: str,
+    automations: Any,
+) -> None:
+    """Step a clock through an afternoon and evening of calendar events."""
+    assert await async_setup_component(hass, "sun", {})
+    assert await async_setup_component(
+        hass, "automation", {"automation": automations()}
+    )
+    await hass.async_block_till_done()
+    lights = LightLog(hass)
+
+    now = dt_util.now()
+    start = dt_util.start_of_local_day(now + datetime.timedelta(days=1)).replace(
+        hour=12
+    )
+    sunset = get_astral_event_next(hass, SUN_EVENT_SUNSET, dt_util.as_utc(start))
+    sunset = dt_util.as_local(sunset)
+    minute = datetime.timedelta(minutes=1)
+    evening = (sunset - datetime.timedelta(minutes=30)).replace(second=0, microsecond=0)
+    night = evening + datetime.timedelta(hours=3)
+    # The light is on while an event overlaps the dark
+    expected = [
+        ("turn_on", sunset),
+        ("turn_off", evening + datetime.timedelta(hours=2)),
+        ("turn_on", night),
+        ("turn_off", night + datetime.timedelta(hours=1)),
+    ]
+    end = night + datetime.timedelta(hours=2)
+
+    with freeze_time(now) as frozen:
+        # Catch the clock up to the start of the simulation
+        while (now := now + datetime.timedelta(hours=1)) < start:
+            frozen.move_to(now)
+            async_fire_time_changed(hass, now)
+            await hass.async_block_till_done()
+        now = start
+        frozen.move_to(now)
+        async_fire_time_changed(hass, now)
+        await hass.async_block_till_done()
+
+        event_start = start + datetime.timedelta(minutes=15)
+        for _ in range(DAYTIME_EVENTS):
+            await create_event(hass, event_start, event_start + 10 * minute)
+            event_start += datetime.timedelta(minutes=20)
+        assert event_start < evening
+        await create_event(hass, evening, expected[1][1])
+        await create_event(hass, night, expected[3][1])
+        await hass.async_block_till_done()
+        lights.calls.clear()
+
+        service_calls = async_capture_events(hass, EVENT_CALL_SERVICE)
+        triggers = 0
+        async_trigger = AutomationEntity.async_trigger
+
+        async def count_triggers(
+            self: AutomationEntity, *args: Any, **kwargs: Any
+        ) -> Any:
+            nonlocal triggers
+            triggers += 1
+            return await async_trigger(self, *args, **kwargs)
+
+        with patch.object(AutomationEntity, "async_trigger", count_triggers):
+            while now < end:
+                now += CLOCK_STEP
+                frozen.move_to(now)
+                async_fire_time_changed(hass, now)
+                await hass.async_block_till_done()
+
+    recomputes = sum(
+        1
+        for event in service_calls
+        if event.data["domain"] == "calendar" and event.data["service"] == "get_events"
+    )
+    lateness = [
+        (called - expected_at).total_seconds()
+        for (_, called), (_, expected_at) in zip(lights.calls, expected, strict=False)
+    ]
+    _LOGGER.info(
+        "%s: light calls=%s automation triggers=%s schedule recomputes=%s lateness=%s",
+        name,
+        len(lights.calls),
+        triggers,
+        recomputes,
+        lateness,
+    )
+
+    if name == "schedule":
+        # The light switches within a clock step of each expected time
+        assert [service for service, _ in lights.calls] == [
+            service for service, _ in expected
+        ]
+        assert all(0 <= late < CLOCK_STEP.total_seconds() for late in lateness)
+        # Only event ends fetch the calendar again, not event starts
+        assert recomputes <= DAYTIME_EVENTS + len(expected)
+    else:
+        # Every event start and end wakes the automation
+        assert triggers >= 2 * DAYTIME_EVENTS
+    assert not error_caplog.records
+
+
+async def end_event_early(hass: HomeAssistant, change: str) -> None:
+    """Delete the current event or move its end into the past."""
+    now = dt_util.now()
+    entity = hass.data[DATA_COMPONENT].get_entity(CALENDAR_ENTITY)
+    assert entity
+    events = await entity.async_get_events(hass, now, now + datetime.timedelta(days=1))
+    assert len(events) == 1
+    event = events[0]
+    assert event.uid
+    if change == "delete":
+        await entity.async_delete_event(event.uid)
+    else:
+        await entity.async_update_event(
+            event.uid,
+            {
+                "summary": event.summary,
+                "dtstart": event.start,
+                "dtend": now - datetime.timedelta(minutes=5),
+            },
+        )
+
+
+@pytest.mark.parametrize(("expected_lingering_timers"), [True])
+@pytest.mark.parametrize("change", ["delete", "shorten"])
+async def test_light_schedule_event_ends_early(
+    hass: HomeAssistant,
+    calendar: Any,
+    error_caplog: pytest.LogCaptureFixture,
+    change: str,
+) -> None:
+    """Turn the light off when the event it is on for is deleted or shortened."""
+    assert await async_setup_component(hass, "sun", {})
+    assert await async_setup_component(
+        hass, "automation", {"automation": schedule_automation()}
+    )
+    await hass.async_block_till_done()
+    lights = LightLog(hass)
+
+    sunset = get_astral_event_next(hass, SUN_EVENT_SUNSET, dt_util.utcnow())
+    now = dt_util.as_local(sunset + datetime.timedelta(minutes=30))
+    with freeze_time(now) as frozen:
+        async_fire_time_changed(hass, now)
+        await hass.async_block_till_done()
+
+        # An event added after dark turns the light on straight away
+        await create_event(
+            hass,
+            now - datetime.timedelta(minutes=10),
+            now + datetime.timedelta(hours=2),
+        )
+        await hass.async_block_till_done()
+        assert lights.calls
+        assert lights.calls[-1][0] == "turn_on"
+        lights.calls.clear()
+
+        now += CLOCK_STEP
+        frozen.move_to(now)
+        async_fire_time_changed(hass, now)
+        await end_event_early(hass, change)
+        await hass.async_block_till_done()
+        assert [service for service, _ in lights.calls] == ["turn_off"]
+
+        # Nothing is left to turn the light on again
+        now += datetime.timedelta(hours=3)
+        frozen.move_to(now)
+        async_fire_time_changed(hass, now)
+        await hass.async_block_till_done()
+    assert [service for service, _ in lights.calls] == ["turn_off"]
+
+    assert not error_caplog.records
@@ -1,21 +1,26 @@
 """Tests for the nest notification automations."""
 
+import asyncio
+import base64
 import copy
 import datetime
+import json
 import logging
 import pathlib
 import re
 import shutil
+import statistics
+import time
 import uuid
 from asyncio import AbstractEventLoop
 from collections.abc import Generator, Mapping
+from dataclasses import dataclass, field
 from typing import Any
 from unittest.mock import AsyncMock, patch
 
 import aiohttp
 import aiohttp.web
 import pytest
-import yaml
 from google_nest_sdm.event import EventType
 from google_nest_sdm.streaming_manager import Message, StreamingManager
 from google_nest_sdm.traits import TraitType
@@ -40,10 +45,17 @@ from pytest_homeassistant_custom_component.test_util.aiohttp import (
 from pytest_homeassistant_custom_component.typing import ClientSessionGenerator
 from yarl import URL
 
+from tests.fixtures.push_gateway import PUSH_RESPONSE, PushGateway
+from tests.yaml_loader import load_config
+
 _LOGGER = logging.getLogger(__name__)
 
 
 AUTOMATION_YAML = pathlib.Path("config/automations/nest_notification.yaml")
+CLEANUP_AUTOMATION_YAML = pathlib.Path("config/automations/nest_media_cleanup.yaml")
+SHELL_COMMAND_YAML = pathlib.Path("config/shell_command.yaml")
+INPUT_TEXT_YAML = pathlib.Path("config/input_text.yaml")
+HANDLED_MEDIA_ENTITY = "input_text.nest_notification_media"
 NEST_DEVICE_NAME = "enterprise/project/sdm/device-id"
 NEST_DERVICE_TRAITS = {
     "name": NEST_DEVICE_NAME,
@@ -55,6 +67,16 @@ NEST_DERVICE_TRAITS = {
         TraitType.CAMERA_MOTION: {},
     },
 }
+SNAPSHOT_DEVICE_NAME = "enterprises/project-id/devices/camera-id"
+SNAPSHOT_DEVICE_TRAITS = {
+    "name": SNAPSHOT_DEVICE_NAME,
+    "type": "sdm.devices.types.CAMERA",
+    "traits": {
+        TraitType.INFO: {"customName": "Driveway"},
+        TraitType.CAMERA_EVENT_IMAGE: {},
+        TraitType.CAMERA_MOTION: {},
+    },
+}
 PROJECT_ID = "a"
 SUBSCRIBER_ID = "projects/cloud-id-9876/subscriptions/subscriber-id-9876"
 NEST_CONFIG_ENTRY_DATA = {
@@ -73,6 +95,8 @@ NEST_CONFIG_ENTRY_DATA = {
 DEVICE_URL_MATCH = re.compile(
     f"{API_URL}/enterprises/project-id/devices/[^:]+:executeCommand"
 )
+# Default limit on runs of an automation in queued mode
+QUEUED_MAX_RUNS = 10
 TEST_IMAGE_URL = "https://domain/sdm_event_snapshot/dGTZwR3o4Y1..."
 TEST_CLIP_URL = "https://domain/clip/XyZ.mp4"
 
@@ -102,8 +126,8 @@ MOBILE_APP_CONFIG_ENTRY_DATA = {
 }
 
 
-@pytest.fixture(autouse=True)
-def cleanup_media_storage(hass: HomeAssistant) -> Generator[None]:
+@pytest.fixture(autouse=True, name="media_path")
+def cleanup_media_storage(hass: HomeAssistant) -> Generator[str]:
     """Test cleanup, remove any media storage persisted during the test."""
     tmp_path = str(uuid.uuid4())
     import homeassistant.components.nest.media_source as nest_media_source
@@ -114,7 +138,7 @@ def cleanup_media_storage(hass: HomeAssistant) -> Generator[None]:
         else "MEDIA_PATH"
     )
     with patch(f"homeassistant.components.nest.media_source.{target}", new=tmp_path):
-        yield
+        yield tmp_path
         shutil.rmtree(hass.config.path(tmp_path), ignore_errors=True)
 
 
@@ -310,6 +334,7 @@ async def mock_default_components(hass: HomeAssistant) -> None:
     assert await async_setup_component(hass, "homeassistant", {})
     # assert await async_setup_component(hass, "ffmpeg", {})
     assert await async_setup_component(hass, "application_credentials", {})
+    assert await async_setup_component(hass, "input_text", load_config(INPUT_TEXT_YAML))
 
 
 @pytest.fixture(name="nest")
@@ -332,12 +357,29 @@ async def mock_nest(
     return config_entry
 
 
+@pytest.fixture(name="push_url")
+def mock_push_url(request: pytest.FixtureRequest) -> str:
+    """Fixture for the push URL, or a local push gateway when requested."""
+    if getattr(request, "param", None) == "push_gateway":
+        gateway: PushGateway = request.getfixturevalue("push_gateway")
+        request.getfixturevalue("push_session")
+        return str(gateway.url)
+    return PUSH_URL
+
+
 @pytest.fixture(name="mobile_app")
-async def mock_mobile_app(hass: HomeAssistant) -> MockConfigEntry:
+async def mock_mobile_app(hass: HomeAssistant, push_url: str) -> MockConfigEntry:
     assert await async_setup_component(hass, "webhook", {})
 
     config_entry = MockConfigEntry(
-        domain="mobile_app", data=MOBILE_APP_CONFIG_ENTRY_DATA
+        domain="mobile_app",
+        data={
+            **MOBILE_APP_CONFIG_ENTRY_DATA,
+            "app_data": {
+                **MOBILE_APP_CONFIG_ENTRY_DATA["app_data"],
+                "push_url": push_url,
+            },
+        },
     )
     config_entry.add_to_hass(hass)
     await hass.config_entries.async_setup(config_entry.entry_id)
@@ -345,13 +387,10 @@ async def mock_mobile_app(hass: HomeAssistant) -> MockConfigEntry:
     return config_entry
 
 
-@pytest.fixture(name="template")
-async def mock_template(
-    hass: HomeAssistant,
-    device_registry: dr.DeviceRegistry,
-    nest: MockConfigEntry,
-    mobile_app: MockConfigEntry,
-) -> None:
+def automation_config(
+    device_registry: dr.DeviceRegistry, replacements: Mapping[str, str] | None = None
+) -> list[dict[str, Any]]:
+    """Load the automation config for the test nest and mobile app devices."""
     nest_device_entry = device_registry.async_get_device(
         identifiers={("nest", NEST_DEVICE_NAME)}
     )
@@ -361,13 +400,25 @@ async def mock_template(
     )
     assert mobile_device_entry
 
-    with AUTOMATION_YAML.open("r") as fd:
-        content = fd.read()
-        content = content.replace("NEST_EVENT_ENTITY_ID", "event.front_door_chime")
-        content = content.replace("NEST_DEVICE_ID", nest_device_entry.id)
-        content = content.replace("MOBILE_APP_DEVICE_ID", mobile_device_entry.id)
-        config = yaml.load(content, Loader=yaml.Loader)
+    return load_config(
+        AUTOMATION_YAML,
+        {
+            "NEST_EVENT_ENTITY_ID": "event.front_door_chime",
+            "NEST_DEVICE_ID": nest_device_entry.id,
+            "MOBILE_APP_DEVICE_ID": mobile_device_entry.id,
+            **(replacements or {}),
+        },
+    )
+
 
+@pytest.fixture(name="template")
+async def mock_template(
+    hass: HomeAssistant,
+    device_registry: dr.DeviceRegistry,
+    nest: MockConfigEntry,
+    mobile_app: MockConfigEntry,
+) -> None:
+    config = automation_config(device_registry)
     assert await async_setup_component(hass, "automation", {"automation": config})
     await hass.async_block_till_done()
     await hass.async_block_till_done()
@@ -484,3 +535,481 @@ async def test_nest_notification(
     assert data["tag"] == ENCODED_EVENT_ID
     assert data["image"]
     assert data["video"]
+
+
+def encode_event_id(event_session_id: str, event_id: str) -> str:
+    """Return the nest_event_id the integration assigns to an event."""
+    return base64.b64encode(json.dumps([event_session_id, event_id]).encode()).decode()
+
+
+@dataclass
+class LoadReport:
+    """Results of replaying a burst of doorbell events."""
+
+    sent: int
+    pushes: int
+    latencies: list[float]
+    queue_depths: list[int]
+    elapsed: float
+
+    @property
+    def delivered(self) -> int:
+        """Return the number of events that resulted in a push."""
+        return len(self.latencies)
+
+    def percentile(self, percent: int) -> float:
+        """Return the push latency in seconds at the percentile."""
+        if not self.latencies:
+            return float("nan")
+        if len(self.latencies) == 1:
+            return self.latencies[0]
+        return statistics.quantiles(self.latencies, n=100, method="inclusive")[
+            percent - 1
+        ]
+
+    def __str__(self) -> str:
+        """Summarize the latency percentiles and queue depth."""
+        return (
+            f"sent={self.sent} delivered={self.delivered} pushes={self.pushes} "
+            f"elapsed={self.elapsed:.3f}s "
+            f"p50={self.percentile(50) * 1000:.1f}ms "
+            f"p95={self.percentile(95) * 1000:.1f}ms "
+            f"p99={self.percentile(99) * 1000:.1f}ms "
+            f"max_queue_depth={max(self.queue_depths, default=0)}"
+        )
+
+
+@dataclass
+class DoorbellLoad:
+    """Replays nest events through the subscriber and times the pushes."""
+
+    hass: HomeAssistant
+    subscriber: AsyncMock
+    automation_entity_ids: list[str]
+    sent_at: dict[str, float] = field(default_factory=dict)
+    pushed_at: dict[str, float] = field(default_factory=dict)
+    pushes: list[dict[str, Any]] = field(default_factory=list)
+    queue_depths: list[int] = field(default_factory=list)
+
+    def record_push(self, payload: dict[str, Any]) -> None:
+        """Record the time a push is sent for an event."""
+        self.pushes.append(payload["data"])
+        self.pushed_at.setdefault(payload["data"]["tag"], time.perf_counter())
+        self.sample_queue_depth()
+
+    async def push(
+        self, method: str, url: URL, data: dict[str, Any]
+    ) -> AiohttpClientMockResponse:
+        """Reply to a push sent to the mocked gateway."""
+        self.record_push(data)
+        return AiohttpClientMockResponse(method, url, json=PUSH_RESPONSE)
+
+    def sample_queue_depth(self) -> None:
+        """Record the number of automation runs in progress or queued."""
+        self.queue_depths.append(
+            sum(
+                state.attributes.get("current", 0)
+                for entity_id in self.automation_entity_ids
+                if (state := self.hass.states.get(entity_id))
+            )
+        )
+
+    async def send(
+        self,
+        message_id: str,
+        events: dict[str, Any],
+        device_name: str = NEST_DEVICE_NAME,
+        timestamp: datetime.datetime | None = None,
+    ) -> None:
+        """Send a message with the events for the device to the subscriber."""
+        message = Message.from_data(
+            {
+                "eventId": message_id,
+                "timestamp": (timestamp or utcnow()).isoformat(timespec="seconds"),
+                "resourceUpdate": {"name": device_name, "events": events},
+            },
+        )
+        await self.subscriber.async_receive_event(message)
+        self.sample_queue_depth()
+
+    async def run(
+        self,
+        event_types: list[EventType],
+        count: int,
+        rate: float | None,
+        with_media: bool = False,
+    ) -> LoadReport:
+        """Send events in turn at the rate per second, or all at once.
+
+        When `with_media` is set each event is followed by its clip preview.
+        """
+        start = time.perf_counter()
+        for i in range(count):
+            event_session_id = f"session-{i}"
+            event_id = f"event-{i}"
+            self.sent_at[encode_event_id(event_session_id, event_id)] = (
+                time.perf_counter()
+            )
+            await self.send(
+                f"message-{i}",
+                {
+                    event_types[i % len(event_types)]: {
+                        "eventSessionId": event_session_id,
+                        "eventId": event_id,
+                    }
+                },
+            )
+            if with_media:
+                await self.send(
+                    f"media-{i}",
+                    {
+                        EventType.CAMERA_CLIP_PREVIEW: {
+                            "eventSessionId": event_session_id,
+                            "previewUrl": NEST_MEDIA_URL,
+                        }
+                    },
+                )
+            if rate is not None:
+                await asyncio.sleep(1 / rate)
+        await self.hass.async_block_till_done()
+
+        return LoadReport(
+            sent=count,
+            pushes=len(self.pushes),
+            latencies=[
+                self.pushed_at[tag] - sent
+                for tag, sent in self.sent_at.items()
+                if tag in self.pushed_at
+            ],
+            queue_depths=self.queue_depths,
+            elapsed=time.perf_counter() - start,
+        )
+
+
+@pytest.fixture(name="load_template")
+async def mock_load_template(
+    hass: HomeAssistant,
+    device_registry: dr.DeviceRegistry,
+    nest: MockConfigEntry,
+    mobile_app: MockConfigEntry,
+) -> list[str]:
+    """Fixture to set up the blueprint for both chime and motion events."""
+    chime = automation_config(device_registry)
+    motion = automation_config(
+        device_registry,
+        {
+            "NEST_EVENT_ENTITY_ID": "event.front_door_motion",
+            "doorbell_chime": "camera_motion",
+        },
+    )
+    for automation in motion:
+        automation["id"] = f"{automation['id']}-motion"
+        automation["alias"] = "Nest Motion Mobile Notification"
+    assert await async_setup_component(
+        hass, "automation", {"automation": chime + motion}
+    )
+    await hass.async_block_till_done()
+    return [
+        "automation.nest_doorbell_mobile_notification",
+        "automation.nest_motion_mobile_notification",
+    ]
+
+
+@pytest.mark.parametrize(("expected_lingering_timers"), [True])
+@pytest.mark.parametrize(
+    ("event_count", "rate"),
+    [
+        (20, 10.0),
+        (50, 100.0),
+        # All at once, within the queue limit of each automation
+        (20, None),
+    ],
+)
+async def test_doorbell_burst_latency(
+    hass: HomeAssistant,
+    aioclient_mock: AiohttpClientMocker,
+    load_template: list[str],
+    subscriber: AsyncMock,
+    event_count: int,
+    rate: float | None,
+) -> None:
+    """Replay a burst of chime and motion events and report push latency."""
+    load = DoorbellLoad(hass, subscriber, load_template)
+    aioclient_mock.post(PUSH_URL, side_effect=load.push)
+
+    report = await load.run(
+        [EventType.DOORBELL_CHIME, EventType.CAMERA_MOTION], event_count, rate
+    )
+    _LOGGER.info("Doorbell burst of %s events at %s/s: %s", event_count, rate, report)
+
+    # Every event is notified once, nothing is dropped from the queue
+    assert report.delivered == event_count
+    assert max(report.queue_depths) <= QUEUED_MAX_RUNS * len(load_template)
+
+
+@pytest.mark.parametrize(("expected_lingering_timers"), [True])
+@pytest.mark.parametrize("push_url", ["push_gateway"], indirect=True)
+@pytest.mark.parametrize(
+    ("event_count", "rate", "gateway_delay"),
+    [
+        (20, 10.0, 0.0),
+        # A slow gateway keeps both automations sending at the same time
+        (50, None, 0.02),
+    ],
+)
+async def test_doorbell_burst_push_gateway(
+    hass: HomeAssistant,
+    push_gateway: PushGateway,
+    load_template: list[str],
+    subscriber: AsyncMock,
+    event_count: int,
+    rate: float | None,
+    gateway_delay: float,
+) -> None:
+    """Replay a burst of events against a local push gateway over the network."""
+    load = DoorbellLoad(hass, subscriber, load_template)
+    push_gateway.on_push = load.record_push
+    push_gateway.delay = gateway_delay
+
+    report = await load.run(
+        [EventType.DOORBELL_CHIME, EventType.CAMERA_MOTION], event_count, rate
+    )
+    _LOGGER.info(
+        "Push gateway burst of %s events at %s/s: %s; %s",
+        event_count,
+        rate,
+        report,
+        push_gateway.stats,
+    )
+
+    assert report.delivered == event_count
+    assert push_gateway.stats.requests == event_count
+    # Each automation sends one push at a time, so connections are reused
+    assert push_gateway.stats.connections <= len(load_template)
+    assert all(payload["push_token"] for payload in push_gateway.payloads)
+
+
+@pytest.mark.parametrize(("expected_lingering_timers"), [True])
+@pytest.mark.parametrize(("event_count", "rate"), [(20, 10.0), (20, None)])
+async def test_doorbell_burst_coalesced(
+    hass: HomeAssistant,
+    aioclient_mock: AiohttpClientMocker,
+    load_template: list[str],
+    subscriber: AsyncMock,
+    event_count: int,
+    rate: float | None,
+) -> None:
+    """Count pushes for a burst of events that each have media."""
+    load = DoorbellLoad(hass, subscriber, load_template)
+    aioclient_mock.post(PUSH_URL, side_effect=load.push)
+    aioclient_mock.get(NEST_MEDIA_URL, content=b"image-bytes")
+
+    report = await load.run(
+        [EventType.DOORBELL_CHIME, EventType.CAMERA_MOTION],
+        event_count,
+        rate,
+        with_media=True,
+    )
+    _LOGGER.info("Coalesced burst of %s events at %s/s: %s", event_count, rate, report)
+
+    # One notification per event then a single silent update with the media
+    assert report.delivered == event_count
+    pushes: dict[str, list[dict[str, Any]]] = {}
+    for push in load.pushes:
+        pushes.setdefault(push["tag"], []).append(push)
+    assert len(pushes) == event_count
+    for tag_pushes in pushes.values():
+        assert len(tag_pushes) == 2
+        first, update = tag_pushes
+        assert "image" not in first
+        assert update["image"]
+        assert update["alert_once"]
+
+    # Restoring the last event after the device was unavailable is ignored
+    for entity_id in ("event.front_door_chime", "event.front_door_motion"):
+        state = hass.states.get(entity_id)
+        assert state
+        hass.states.async_set(entity_id, "unavailable")
+        hass.states.async_set(entity_id, state.state, state.attributes)
+    await hass.async_block_till_done()
+    assert len(load.pushes) == report.pushes
+
+
+@pytest.mark.parametrize(("expected_lingering_timers"), [True])
+async def test_doorbell_duplicate_media(
+    hass: HomeAssistant,
+    aioclient_mock: AiohttpClientMocker,
+    load_template: list[str],
+    subscriber: AsyncMock,
+) -> None:
+    """Send a single media update per event for repeated and late media events."""
+    load = DoorbellLoad(hass, subscriber, load_template)
+    aioclient_mock.post(PUSH_URL, side_effect=load.push)
+    aioclient_mock.get(NEST_MEDIA_URL, content=b"image-bytes")
+
+    def chime(i: int) -> dict[str, Any]:
+        return {
+            EventType.DOORBELL_CHIME: {
+                "eventSessionId": f"session-{i}",
+                "eventId": f"event-{i}",
+            }
+        }
+
+    def media(i: int) -> dict[str, Any]:
+        return {
+            EventType.CAMERA_CLIP_PREVIEW: {
+                "eventSessionId": f"session-{i}",
+                "previewUrl": NEST_MEDIA_URL,
+            }
+        }
+
+    await load.send("chime-0", chime(0))
+    await load.send("media-0", media(0))
+    # The same media event delivered twice
+    await load.send("media-0-again", media(0))
+    await hass.async_block_till_done()
+    await load.send("chime-1", chime(1))
+    await load.send("media-1", media(1))
+    # Media for the first event arriving after the next event
+    await load.send("media-0-late", media(0))
+    await hass.async_block_till_done()
+
+    pushes: dict[str, list[dict[str, Any]]] = {}
+    for push in load.pushes:
+        pushes.setdefault(push["tag"], []).append(push)
+    assert list(pushes) == [
+        encode_event_id("session-0", "event-0"),
+        encode_event_id("session-1", "event-1"),
+    ]
+    for tag_pushes in pushes.values():
+        assert len(tag_pushes) == 2
+        first, update = tag_pushes
+        assert "image" not in first
+        assert update["image"]
+
+    state = hass.states.get(HANDLED_MEDIA_ENTITY)
+    assert state
+    assert len(state.state.split()) == 2
+
+
+# Soak test scale and the budget the cleanup automation is configured with
+SOAK_EVENT_COUNT = 2_000
+SOAK_MAX_FILES = 200
+SOAK_MAX_BYTES = 4 * 1024 * 1024
+CLIP_CONTENT = b"c" * 48 * 1024
+SNAPSHOT_CONTENT = b"s" * 16 * 1024
+
+
+def media_usage(path: pathlib.Path) -> tuple[set[str], int]:
+    """Return the files and total bytes under the media path."""
+    files = [file for file in path.rglob("*") if file.is_file()]
+    return {str(file) for file in files}, sum(file.stat().st_size for file in files)
+
+
+@pytest.fixture(name="snapshot_camera")
+def mock_snapshot_camera(create_device: CreateDevice) -> None:
+    """Fixture to add a camera that publishes snapshots for its events."""
+    create_device.create(raw_data=SNAPSHOT_DEVICE_TRAITS)
+
+
+@pytest.fixture(name="cleanup_automation")
+async def mock_cleanup_automation(hass: HomeAssistant, media_path: str) -> str:
+    """Fixture to set up the media cleanup automation with the soak test budget."""
+    assert await async_setup_component(
+        hass, "shell_command", load_config(SHELL_COMMAND_YAML)
+    )
+    config = load_config(
+        CLEANUP_AUTOMATION_YAML,
+        {
+            "media_path: nest/event_media": f"media_path: {media_path}",
+            "max_files: 1000": f"max_files: {SOAK_MAX_FILES}",
+            "max_bytes: 500000000": f"max_bytes: {SOAK_MAX_BYTES}",
+        },
+    )
+    assert await async_setup_component(hass, "automation", {"automation": config})
+    await hass.async_block_till_done()
+    return "automation.nest_media_cleanup"
+
+
+@pytest.mark.parametrize(("expected_lingering_timers"), [True])
+async def test_media_cache_soak(
+    hass: HomeAssistant,
+    aioclient_mock: AiohttpClientMocker,
+    snapshot_camera: None,
+    nest: MockConfigEntry,
+    auth: FakeAuth,
+    subscriber: AsyncMock,
+    media_path: str,
+    cleanup_automation: str,
+) -> None:
+    """Replay clip preview and snapshot events and keep media within budget.
+
+    The cleanup automation prunes as each event arrives, so the budget holds
+    throughout the run and not only after a scheduled cleanup.
+    """
+    aioclient_mock.get(NEST_MEDIA_URL, content=CLIP_CONTENT)
+    load = DoorbellLoad(hass, subscriber, [])
+    path = pathlib.Path(hass.config.path(media_path))
+
+    # Timestamps are one second apart since they name the media files
+    start = utcnow()
+    cached: set[str] = set()
+    for i in range(SOAK_EVENT_COUNT):
+        timestamp = start + datetime.timedelta(seconds=i)
+        event_session_id = f"session-{i}"
+        if i % 2:
+            auth.responses.extend(
+                [
+                    aiohttp.web.json_response(
+                        {"results": {"url": TEST_IMAGE_URL, "token": "g.0.token"}}
+                    ),
+                    aiohttp.web.Response(body=SNAPSHOT_CONTENT),
+                ]
+            )
+            await load.send(
+                f"snapshot-{i}",
+                {
+                    EventType.CAMERA_MOTION: {
+                        "eventSessionId": event_session_id,
+                        "eventId": f"event-{i}",
+                    }
+                },
+                device_name=SNAPSHOT_DEVICE_NAME,
+                timestamp=timestamp,
+            )
+        else:
+            await load.send(
+                f"chime-{i}",
+                {
+                    EventType.DOORBELL_CHIME: {
+                        "eventSessionId": event_session_id,
+                        "eventId": f"event-{i}",
+                    }
+                },
+                timestamp=timestamp,
+            )
+            await load.send(
+                f"clip-{i}",
+                {
+                    EventType.CAMERA_CLIP_PREVIEW: {
+                        "eventSessionId": event_session_id,
+                        "previewUrl": NEST_MEDIA_URL,
+                    }
+                },
+                timestamp=timestamp,
+            )
+
+        await hass.async_block_till_done()
+        files, size = await hass.async_add_executor_job(media_usage, path)
+        cached |= files
+        assert len(files) <= SOAK_MAX_FILES, f"After {i + 1} events"
+        assert size <= SOAK_MAX_BYTES, f"After {i + 1} events"
+
+    # Media was cached for both cameras and evicted down to the budget
+    files, size = await hass.async_add_executor_job(media_usage, path)
+    _LOGGER.info(
+        "Cached %s files, kept %s files, %s bytes", len(cached), len(files), size
+    )
+    assert len(cached) > SOAK_MAX_FILES
+    assert files
+    assert not auth.responses
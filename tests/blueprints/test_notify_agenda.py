@@ -1,30 +1,43 @@
 """Tests for the conversation agent agenda notifications."""
 
+import asyncio
 import datetime
 import logging
 import pathlib
+import time
+from dataclasses import dataclass
 from typing import Any
 from unittest.mock import patch
 
 import pytest
-import yaml
 from freezegun import freeze_time
 from homeassistant.config_entries import ConfigEntryState
 from homeassistant.const import Platform
-from homeassistant.core import HomeAssistant, ServiceCall
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+)
 from homeassistant.setup import async_setup_component
+from homeassistant.util import dt as dt_util
+from ical.event import Event
 from pytest_homeassistant_custom_component.common import (
     MockConfigEntry,
     async_fire_time_changed,
     async_mock_service,
 )
 
+from tests.fixtures.local_calendar_fixture import generate_events
+from tests.yaml_loader import load_config
+
 _LOGGER = logging.getLogger(__name__)
 
 
 AUTOMATION_YAML = pathlib.Path("config/automations/notify_agenda.yaml")
 NOTIFY_ENTITY = "notify.notifier"
 WEATHER_ENTITY = "weather.demo_weather_north"
+CALENDAR_ENTITY = "calendar.personal"
 
 
 @pytest.fixture(autouse=True)
@@ -74,23 +87,19 @@ async def mock_template(
     weather: Any,
     notify: Any,
 ) -> None:
-    with AUTOMATION_YAML.open("r") as fd:
-        content = fd.read()
-        content = content.replace("weather.woodgreen", WEATHER_ENTITY)
-        content = content.replace(
-            "conversation_agent: 2ee2edd1e9dbee5de7474922ce3cee42",
-            "conversation_agent: conversation.home_assistant",
-        )
-        content = content.replace(
-            "notify_service: notify.discord",
-            "notify_service: notify.persistent_notification",
-        )
-        content = content.replace(
-            "notify_target: notify.discord", "notify_target: notify.notifier"
-        )
-        print(content)
-        config = yaml.load(content, Loader=yaml.Loader)
-
+    config = load_config(
+        AUTOMATION_YAML,
+        {
+            "weather.woodgreen": WEATHER_ENTITY,
+            "conversation_agent: 2ee2edd1e9dbee5de7474922ce3cee42": (
+                "conversation_agent: conversation.home_assistant"
+            ),
+            "notify_service: notify.discord": (
+                "notify_service: notify.persistent_notification"
+            ),
+            "notify_target: notify.discord": "notify_target: notify.notifier",
+        },
+    )
     assert await async_setup_component(hass, "automation", {"automation": config})
     await hass.async_block_till_done()
     await hass.async_block_till_done()
@@ -134,3 +143,157 @@ async def test_notify_agenda(
 
     # Automation completes with success
     assert not error_caplog.records
+
+
+# Artificial latency of the mocked services, e.g. a slow cloud weather API
+WEATHER_DELAY = 0.3
+CALENDAR_DELAY = 0.2
+
+
+@dataclass
+class SlowService:
+    """Service that replies after a delay and records when it ran."""
+
+    delay: float
+    response: ServiceResponse
+    started: float | None = None
+    finished: float | None = None
+
+    async def async_handle(self, call: ServiceCall) -> ServiceResponse:
+        """Handle the service call."""
+        self.started = time.perf_counter()
+        await asyncio.sleep(self.delay)
+        self.finished = time.perf_counter()
+        return self.response
+
+
+@pytest.mark.parametrize(("expected_lingering_timers"), [True])
+async def test_notify_agenda_fetch_latency(
+    hass: HomeAssistant,
+    template: Any,
+    notify_service_calls: list[ServiceCall],
+) -> None:
+    """Weather and calendar fetches overlap so their latency is not additive."""
+    weather = SlowService(
+        WEATHER_DELAY,
+        {
+            WEATHER_ENTITY: {
+                "forecast": [
+                    {"condition": "sunny", "temperature": 21, "precipitation": 0}
+                ]
+            }
+        },
+    )
+    calendar = SlowService(CALENDAR_DELAY, {CALENDAR_ENTITY: {"events": []}})
+    hass.services.async_register(
+        "weather",
+        "get_forecasts",
+        weather.async_handle,
+        supports_response=SupportsResponse.ONLY,
+    )
+    hass.services.async_register(
+        "calendar",
+        "get_events",
+        calendar.async_handle,
+        supports_response=SupportsResponse.ONLY,
+    )
+
+    start = time.perf_counter()
+    await hass.services.async_call(
+        "automation",
+        "trigger",
+        {"entity_id": "automation.conversation_agent_agenda_notification"},
+        blocking=True,
+    )
+    await hass.async_block_till_done()
+    elapsed = time.perf_counter() - start
+    _LOGGER.info(
+        "Agenda notification took %.3fs (weather %.3fs, calendar %.3fs)",
+        elapsed,
+        WEATHER_DELAY,
+        CALENDAR_DELAY,
+    )
+
+    assert len(notify_service_calls) == 1
+    assert weather.started is not None and weather.finished is not None
+    assert calendar.started is not None and calendar.finished is not None
+    # Both fetches are in flight at the same time. The elapsed time is only
+    # logged since it depends on the load of the machine.
+    assert weather.started < calendar.finished
+    assert calendar.started < weather.finished
+
+
+# Defaults of the blueprint inputs for the size of the agenda in the prompt
+AGENDA_MAX_CHARS = 2000
+DESCRIPTION_MAX_CHARS = 200
+PROMPT_EVENT_COUNTS = [0, 10, 100, 1_000]
+LONG_DESCRIPTION = "Bring the quarterly planning notes. " * 30
+
+
+@pytest.fixture(name="calendar_events")
+def mock_calendar_events(request: pytest.FixtureRequest) -> list[Event]:
+    """Fixture to seed the calendar with a parametrized number of events."""
+    if not (event_count := getattr(request, "param", 0)):
+        return []
+    return generate_events(
+        event_count,
+        dt_util.now() + datetime.timedelta(minutes=5),
+        datetime.timedelta(hours=17) / event_count,
+        description=LONG_DESCRIPTION,
+    )
+
+
+@pytest.mark.parametrize(("expected_lingering_timers"), [True])
+@pytest.mark.parametrize("calendar_events", PROMPT_EVENT_COUNTS, indirect=True)
+async def test_notify_agenda_prompt_size(
+    hass: HomeAssistant,
+    template: Any,
+    calendar_events: list[Event],
+    calendar: Any,
+    notify_service_calls: list[ServiceCall],
+) -> None:
+    """Measure the conversation agent prompt size against the number of events."""
+    conversation_calls = async_mock_service(
+        hass,
+        "conversation",
+        "process",
+        response={"response": {"speech": {"plain": {"speech": "Good morning"}}}},
+    )
+
+    await hass.services.async_call(
+        "automation",
+        "trigger",
+        {"entity_id": "automation.conversation_agent_agenda_notification"},
+        blocking=True,
+    )
+    await hass.async_block_till_done()
+
+    assert len(conversation_calls) == 1
+    prompt = conversation_calls[0].data["text"]
+    agenda = prompt.split(" hours:\n", 1)[1].split("\n\n", 1)[0]
+    lines = agenda.splitlines()
+    _LOGGER.info(
+        "Agenda prompt for %s events: %s chars (agenda %s chars, %s lines)",
+        len(calendar_events),
+        len(prompt),
+        len(agenda),
+        len(lines),
+    )
+    assert len(notify_service_calls) == 1
+
+    if not calendar_events:
+        assert lines == ["- No upcoming events."]
+        return
+
+    # The earliest events are kept and the rest are counted
+    assert lines[0].endswith(": " + LONG_DESCRIPTION[:DESCRIPTION_MAX_CHARS] + "...")
+    assert "Event 0" in lines[0]
+    assert all(len(line) < DESCRIPTION_MAX_CHARS + 100 for line in lines)
+    if len(calendar_events) == len(lines):
+        assert len(agenda) <= AGENDA_MAX_CHARS
+    else:
+        *event_lines, omitted = lines
+        assert len("\n".join(event_lines)) <= AGENDA_MAX_CHARS
+        assert omitted == (
+            f"- {len(calendar_events) - len(event_lines)} more events not shown."
+        )
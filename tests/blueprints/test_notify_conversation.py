@@ -1,24 +1,30 @@
 """Tests for the conversation agent agenda notifications."""
 
+import asyncio
 import datetime
 import logging
 import pathlib
-from typing import Any
+from typing import Any, Literal
 from unittest.mock import patch
 
 import pytest
-import yaml
 from freezegun import freeze_time
+from homeassistant.components import conversation
 from homeassistant.config_entries import ConfigEntryState
-from homeassistant.const import Platform
+from homeassistant.const import EVENT_CALL_SERVICE, Platform
 from homeassistant.core import HomeAssistant, ServiceCall
+from homeassistant.helpers import intent
 from homeassistant.setup import async_setup_component
+from homeassistant.util import dt as dt_util
 from pytest_homeassistant_custom_component.common import (
     MockConfigEntry,
+    async_capture_events,
     async_fire_time_changed,
     async_mock_service,
 )
 
+from tests.yaml_loader import load_config
+
 _LOGGER = logging.getLogger(__name__)
 
 
@@ -50,27 +56,30 @@ async def mock_notify(hass: HomeAssistant) -> MockConfigEntry:
     return config_entry
 
 
+@pytest.fixture(name="conversation_agent")
+def mock_conversation_agent() -> str:
+    """Fixture for the conversation agent used by the automation."""
+    return "conversation.home_assistant"
+
+
 @pytest.fixture(name="template")
 async def mock_template(
     hass: HomeAssistant,
     notify: Any,
+    conversation_agent: str,
 ) -> None:
-    with AUTOMATION_YAML.open("r") as fd:
-        content = fd.read()
-        content = content.replace(
-            "conversation_agent: 2ee2edd1e9dbee5de7474922ce3cee42",
-            "conversation_agent: conversation.home_assistant",
-        )
-        content = content.replace(
-            "notify_service: notify.discord",
-            "notify_service: notify.persistent_notification",
-        )
-        content = content.replace(
-            "notify_target: notify.discord", "notify_target: notify.notifier"
-        )
-        print(content)
-        config = yaml.load(content, Loader=yaml.Loader)
-
+    config = load_config(
+        AUTOMATION_YAML,
+        {
+            "conversation_agent: 2ee2edd1e9dbee5de7474922ce3cee42": (
+                f"conversation_agent: {conversation_agent}"
+            ),
+            "notify_service: notify.discord": (
+                "notify_service: notify.persistent_notification"
+            ),
+            "notify_target: notify.discord": "notify_target: notify.notifier",
+        },
+    )
     assert await async_setup_component(hass, "automation", {"automation": config})
     await hass.async_block_till_done()
     await hass.async_block_till_done()
@@ -115,3 +124,148 @@ async def test_notify_agenda(
 
     # Automation completes with success
     assert not error_caplog.records
+
+
+CACHE_YAML = pathlib.Path("config/templates/intent_script_cache.yaml")
+INTENT_SCRIPT_YAMLS = [
+    pathlib.Path("config/intent_scripts/todays_agenda.yaml"),
+    pathlib.Path("config/intent_scripts/weather_forecast.yaml"),
+]
+CACHE_ENTITY = "sensor.intent_script_cache"
+WEATHER_ENTITY = "weather.demo_weather_north"
+FAKE_AGENT_ENTRY_ID = "fake-agent-entry-id"
+# Time the model takes between tool calls
+MODEL_LATENCY = 0.05
+# Tools the fake agent calls, with repeats like a model that fetches twice
+TOOL_CALLS = [
+    "GetWeatherForecast",
+    "GetTodaysAgenda",
+    "GetWeatherForecast",
+    "GetTodaysAgenda",
+    "GetTodaysAgenda",
+]
+
+
+class FakeAgent(conversation.AbstractConversationAgent):
+    """Conversation agent that calls a fixed list of intent script tools."""
+
+    def __init__(self, hass: HomeAssistant, tool_calls: list[str]) -> None:
+        """Initialize FakeAgent."""
+        self.hass = hass
+        self.tool_calls = tool_calls
+        self.tool_responses: list[str] = []
+
+    @property
+    def supported_languages(self) -> Literal["*"]:
+        """Return the supported languages."""
+        return "*"
+
+    async def async_process(
+        self, user_input: conversation.ConversationInput
+    ) -> conversation.ConversationResult:
+        """Call each tool in turn and reply with their responses."""
+        for intent_type in self.tool_calls:
+            await asyncio.sleep(MODEL_LATENCY)
+            response = await intent.async_handle(
+                self.hass, "conversation", intent_type, {}
+            )
+            self.tool_responses.append(response.speech["plain"]["speech"])
+        response = intent.IntentResponse(language=user_input.language)
+        response.async_set_speech("\n".join(self.tool_responses))
+        return conversation.ConversationResult(response=response)
+
+
+@pytest.fixture(name="weather")
+async def mock_weather_demo(hass: HomeAssistant) -> MockConfigEntry:
+    config_entry = MockConfigEntry(domain="demo")
+    config_entry.add_to_hass(hass)
+    with patch(
+        "homeassistant.components.demo.COMPONENTS_WITH_CONFIG_ENTRY_DEMO_PLATFORM",
+        [Platform.WEATHER],
+    ):
+        await hass.config_entries.async_setup(config_entry.entry_id)
+    assert config_entry.state == ConfigEntryState.LOADED
+    return config_entry
+
+
+@pytest.fixture(name="intent_scripts")
+async def mock_intent_scripts(hass: HomeAssistant, weather: Any, calendar: Any) -> None:
+    """Fixture to set up the intent script tools and their cache."""
+    config = load_config(CACHE_YAML)
+    assert await async_setup_component(hass, "template", {"template": config})
+    config = {}
+    for path in INTENT_SCRIPT_YAMLS:
+        config.update(load_config(path, {"weather.woodgreen": WEATHER_ENTITY}))
+    assert await async_setup_component(hass, "intent_script", {"intent_script": config})
+    await hass.async_block_till_done()
+
+
+@pytest.fixture(name="fake_agent")
+def mock_fake_agent(hass: HomeAssistant) -> FakeAgent:
+    """Fixture to register the fake conversation agent."""
+    config_entry = MockConfigEntry(domain="fake_agent", entry_id=FAKE_AGENT_ENTRY_ID)
+    config_entry.add_to_hass(hass)
+    agent = FakeAgent(hass, TOOL_CALLS)
+    conversation.async_set_agent(hass, config_entry, agent)
+    return agent
+
+
+@pytest.mark.parametrize(("expected_lingering_timers"), [True])
+@pytest.mark.parametrize("conversation_agent", [FAKE_AGENT_ENTRY_ID])
+async def test_notify_conversation_tool_cache(
+    hass: HomeAssistant,
+    intent_scripts: Any,
+    fake_agent: FakeAgent,
+    template: Any,
+    notify_service_calls: list[ServiceCall],
+) -> None:
+    """Repeated tool calls in a run reuse the first fetch of each tool."""
+    service_calls = async_capture_events(hass, EVENT_CALL_SERVICE)
+
+    def fetch_count(domain: str, service: str) -> int:
+        return sum(
+            1
+            for event in service_calls
+            if event.data["domain"] == domain and event.data["service"] == service
+        )
+
+    await hass.services.async_call(
+        "automation",
+        "trigger",
+        {"entity_id": "automation.conversation_agent_intent_based_agenda_notification"},
+        blocking=True,
+    )
+    await hass.async_block_till_done()
+
+    assert len(notify_service_calls) == 1
+    assert len(fake_agent.tool_responses) == len(TOOL_CALLS)
+    assert fetch_count("weather", "get_forecasts") == 1
+    assert fetch_count("calendar", "get_events") == 1
+    # Cached responses render the same speech as the fetched ones
+    weather, agenda, *repeats = fake_agent.tool_responses
+    assert repeats == [weather, agenda, agenda]
+
+    # Only the payload the speech is rendered from is cached
+    state = hass.states.get(CACHE_ENTITY)
+    assert state
+    responses = state.attributes["responses"]
+    assert responses["GetWeatherForecast"]["response"].keys() == {
+        "condition",
+        "temperature",
+        "precipitation",
+    }
+    assert responses["GetTodaysAgenda"]["response"].keys() == {"events"}
+
+    # An expired entry is fetched again
+    expired = (dt_util.now() - datetime.timedelta(hours=1)).isoformat()
+    responses = {
+        intent_type: {**entry, "fetched_at": expired}
+        for intent_type, entry in state.attributes["responses"].items()
+    }
+    hass.states.async_set(
+        CACHE_ENTITY, state.state, {**state.attributes, "responses": responses}
+    )
+    response = await intent.async_handle(hass, "test", "GetWeatherForecast", {})
+    assert response.speech["plain"]["speech"] == weather
+    assert fetch_count("weather", "get_forecasts") == 2
+    assert fetch_count("calendar", "get_events") == 1
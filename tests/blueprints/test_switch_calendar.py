@@ -0,0 +1,131 @@
+"""Tests for the calendar switch schedule blueprints."""
+
+import logging
+from typing import Any
+
+import pytest
+from homeassistant.core import HomeAssistant, ServiceCall
+from homeassistant.setup import async_setup_component
+
+from tests.fixtures.config_benchmark import ConfigBenchmark
+
+_LOGGER = logging.getLogger(__name__)
+
+
+PAIR_COUNT = 200
+CALENDARS = [f"binary_sensor.schedule_{i}" for i in range(PAIR_COUNT)]
+SWITCHES = [f"switch.valve_{i}" for i in range(PAIR_COUNT)]
+
+
+def per_pair_automations() -> list[dict[str, Any]]:
+    """Return one automation for each calendar and switch."""
+    return [
+        {
+            "id": f"switch-calendar-{i}",
+            "alias": f"Switch Calendar {i}",
+            "use_blueprint": {
+                "path": "allenporter/switch_calendar.yaml",
+                "input": {
+                    "calendar_sensor": calendar,
+                    "target_switch": {"entity_id": switch},
+                },
+            },
+        }
+        for i, (calendar, switch) in enumerate(zip(CALENDARS, SWITCHES, strict=True))
+    ]
+
+
+def batched_automations() -> list[dict[str, Any]]:
+    """Return a single automation for every calendar and switch."""
+    return [
+        {
+            "id": "switch-calendar-batch",
+            "alias": "Switch Calendar Batch",
+            "use_blueprint": {
+                "path": "allenporter/switch_calendar_batch.yaml",
+                "input": {
+                    "calendar_sensors": CALENDARS,
+                    "switch_schedule": dict(zip(CALENDARS, SWITCHES, strict=True)),
+                },
+            },
+        }
+    ]
+
+
+class SwitchFleet:
+    """Switch services that record each call and update the switch states."""
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize SwitchFleet."""
+        self.hass = hass
+        self.calls: list[ServiceCall] = []
+        for service in ("turn_on", "turn_off"):
+            hass.services.async_register("switch", service, self.async_handle)
+        for switch in SWITCHES:
+            hass.states.async_set(switch, "off")
+
+    async def async_handle(self, call: ServiceCall) -> None:
+        """Handle a switch service call."""
+        self.calls.append(call)
+        entity_ids = call.data["entity_id"]
+        if isinstance(entity_ids, str):
+            entity_ids = [entity_ids]
+        state = "on" if call.service == "turn_on" else "off"
+        for entity_id in entity_ids:
+            self.hass.states.async_set(entity_id, state)
+
+    def call_count(self, service: str) -> int:
+        """Return the number of calls made to the service."""
+        return sum(1 for call in self.calls if call.service == service)
+
+
+@pytest.mark.parametrize(
+    ("name", "automations"),
+    [
+        ("per_pair", per_pair_automations),
+        ("batched", batched_automations),
+    ],
+)
+async def test_switch_calendar_benchmark(
+    hass: HomeAssistant,
+    config_benchmark: ConfigBenchmark,
+    error_caplog: pytest.LogCaptureFixture,
+    name: str,
+    automations: Any,
+) -> None:
+    """Compare one automation per calendar with a single batched automation."""
+    for calendar in CALENDARS:
+        hass.states.async_set(calendar, "off")
+    fleet = SwitchFleet(hass)
+    name = f"switch_calendar[{name}]"
+
+    with config_benchmark.measure(name, "setup"):
+        assert await async_setup_component(
+            hass, "automation", {"automation": automations()}
+        )
+        await hass.async_block_till_done()
+
+    # Every schedule starts and ends at the same time
+    for state in ("on", "off"):
+        with config_benchmark.measure(name, f"turn_{state}"):
+            for calendar in CALENDARS:
+                hass.states.async_set(calendar, state)
+            await hass.async_block_till_done()
+        assert all(hass.states.is_state(switch, state) for switch in SWITCHES)
+
+    _LOGGER.info(
+        "%s: %s turn_on=%s turn_off=%s",
+        name,
+        config_benchmark.results[name],
+        fleet.call_count("turn_on"),
+        fleet.call_count("turn_off"),
+    )
+    if name == "switch_calendar[batched]":
+        # Changes while a run is in progress are covered by one pending run
+        assert fleet.call_count("turn_on") <= 2
+        assert fleet.call_count("turn_off") <= 2
+    else:
+        assert fleet.call_count("turn_on") == PAIR_COUNT
+        assert fleet.call_count("turn_off") == PAIR_COUNT
+    config_benchmark.check(name)
+    assert not error_caplog.records
@@ -0,0 +1,72 @@
+"""Tests for the offline blueprint validator."""
+
+import pathlib
+import shutil
+
+import pytest
+
+from tests.validate_blueprints import (
+    AUTOMATION_DIR,
+    BLUEPRINT_DIR,
+    CONFIG_DIR,
+    find_files,
+    validate,
+    validate_file,
+)
+
+SWITCH_CALENDAR = BLUEPRINT_DIR / "allenporter/switch_calendar.yaml"
+
+
+@pytest.fixture(name="config_dir")
+def mock_config_dir(tmp_path: pathlib.Path) -> pathlib.Path:
+    """Fixture for a copy of the blueprints and automations."""
+    config_dir = tmp_path / "config"
+    for directory in (BLUEPRINT_DIR, AUTOMATION_DIR):
+        shutil.copytree(CONFIG_DIR / directory, config_dir / directory)
+    return config_dir
+
+
+@pytest.mark.parametrize("path", find_files(CONFIG_DIR), ids=str)
+def test_config_is_valid(path: pathlib.Path) -> None:
+    """Test every blueprint and blueprint automation in the config validates."""
+    assert validate_file(CONFIG_DIR, path) == []
+
+
+def test_unchanged_files_are_skipped(
+    config_dir: pathlib.Path, tmp_path: pathlib.Path
+) -> None:
+    """Test files are only validated again after they or their blueprints change."""
+    cache_file = tmp_path / "cache.json"
+    files = [str(path) for path in find_files(config_dir)]
+    automations = [path for path in files if path.startswith(str(AUTOMATION_DIR))]
+
+    result = validate(config_dir, cache_file, workers=2)
+    assert not result.errors
+    assert sorted(result.validated) == sorted(files)
+    assert not result.skipped
+
+    result = validate(config_dir, cache_file, workers=2)
+    assert not result.validated
+    assert sorted(result.skipped) == sorted(files)
+
+    # Editing a blueprint validates it and the automations again
+    path = config_dir / SWITCH_CALENDAR
+    path.write_text(path.read_text().replace("Switch on Calendar", "Edited"))
+    result = validate(config_dir, cache_file, workers=2)
+    assert not result.errors
+    assert sorted(result.validated) == sorted([str(SWITCH_CALENDAR), *automations])
+
+
+def test_invalid_blueprint(config_dir: pathlib.Path, tmp_path: pathlib.Path) -> None:
+    """Test an invalid blueprint is reported and validated again on each run."""
+    cache_file = tmp_path / "cache.json"
+    path = config_dir / SWITCH_CALENDAR
+    path.write_text(
+        path.read_text().replace("target: !input target_switch", "target: !input nope")
+    )
+
+    for _ in range(2):
+        result = validate(config_dir, cache_file, workers=2)
+        assert list(result.errors) == [str(SWITCH_CALENDAR)]
+        assert "nope" in result.errors[str(SWITCH_CALENDAR)][0]
+        assert str(SWITCH_CALENDAR) in result.validated
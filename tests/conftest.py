@@ -2,6 +2,7 @@
 
 import logging
 import pathlib
+import shutil
 from collections.abc import Generator
 from unittest.mock import patch
 
@@ -15,19 +16,36 @@ CONFIG_DIR = pathlib.Path(__file__).parent.parent / "config"
 
 pytest_plugins = [
     "tests.fixtures.local_calendar_fixture",
+    "tests.fixtures.shard_balance",
+    "tests.fixtures.config_benchmark",
+    "tests.fixtures.push_gateway",
+    "tests.fixtures.setup_profile",
+    "tests.fixtures.template_renders",
 ]
 
 
+@pytest.fixture(scope="session")
+def worker_config_dir(tmp_path_factory: pytest.TempPathFactory) -> pathlib.Path:
+    """Copy of the configuration directory private to this test worker.
+
+    Tests write into the config directory (e.g. nest media), so each
+    pytest-xdist worker gets its own copy to avoid interfering with the others.
+    """
+    config_dir = tmp_path_factory.mktemp("config")
+    shutil.copytree(CONFIG_DIR, config_dir, dirs_exist_ok=True)
+    return config_dir
+
+
 @pytest.fixture(autouse=True)
-def mock_config_dir() -> Generator[None]:
+def mock_config_dir(worker_config_dir: pathlib.Path) -> Generator[None]:
     with (
         patch(
             "pytest_homeassistant_custom_component.common.get_test_config_dir",
-            return_value=CONFIG_DIR,
+            return_value=worker_config_dir,
         ),
         patch(
             "pytest_homeassistant_custom_component.plugins.get_test_config_dir",
-            return_value=CONFIG_DIR,
+            return_value=worker_config_dir,
         ),
     ):
         yield
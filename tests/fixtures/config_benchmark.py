@@ -0,0 +1,111 @@
+"""Fixtures for benchmarking setup and service calls against a stored baseline.
+
+Timings are wall clock times, so they are only comparable on the machine that
+recorded them. Record a baseline in `tests/config_benchmark.json` with
+`--update-benchmarks`, then run with `--check-benchmarks` on the same machine
+to fail tests with a stage slower than the baseline by more than
+`REGRESSION_FACTOR`, ignoring differences below `REGRESSION_SLACK` seconds
+which are dominated by timer noise. A stage without a baseline only warns.
+
+The baseline is not committed and without `--check-benchmarks` the timings are
+only logged, so the benchmarks pass on any machine.
+"""
+
+import json
+import pathlib
+import time
+import warnings
+from collections.abc import Generator
+from contextlib import contextmanager
+
+import pytest
+
+BASELINE_FILE = pathlib.Path(__file__).parent.parent / "config_benchmark.json"
+REGRESSION_FACTOR = 2.0
+REGRESSION_SLACK = 0.05
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    """Register the option for updating the benchmark baseline."""
+    parser.addoption(
+        "--update-benchmarks",
+        action="store_true",
+        default=False,
+        help=f"Record benchmark timings as the new baseline in {BASELINE_FILE.name}.",
+    )
+    parser.addoption(
+        "--check-benchmarks",
+        action="store_true",
+        default=False,
+        help=f"Fail benchmarks slower than the baseline in {BASELINE_FILE.name}.",
+    )
+
+
+def _load_baseline() -> dict[str, dict[str, float]]:
+    """Load the stored baseline, if any."""
+    if not BASELINE_FILE.exists():
+        return {}
+    return json.loads(BASELINE_FILE.read_text())
+
+
+class ConfigBenchmark:
+    """Records the time spent in each stage of setting up a config file."""
+
+    def __init__(
+        self, baseline: dict[str, dict[str, float]], update: bool, check: bool
+    ) -> None:
+        """Initialize ConfigBenchmark."""
+        self.baseline = baseline
+        self.update = update
+        self.check_baseline = check and not update
+        self.results: dict[str, dict[str, float]] = {}
+
+    @contextmanager
+    def measure(self, name: str, stage: str) -> Generator[None]:
+        """Time a stage for the named benchmark."""
+        start = time.perf_counter()
+        yield
+        elapsed = time.perf_counter() - start
+        self.results.setdefault(name, {})[stage] = round(elapsed, 4)
+
+    def regressions(self, name: str) -> list[str]:
+        """Return a description of each stage slower than its baseline."""
+        if not self.check_baseline:
+            return []
+        baseline = self.baseline.get(name, {})
+        regressions = []
+        for stage, elapsed in self.results.get(name, {}).items():
+            if stage not in baseline:
+                warnings.warn(
+                    f"{name} {stage}: {elapsed:.4f}s has no baseline, record it "
+                    "with --update-benchmarks",
+                    stacklevel=2,
+                )
+            elif elapsed > baseline[stage] * REGRESSION_FACTOR + REGRESSION_SLACK:
+                regressions.append(
+                    f"{name} {stage}: {elapsed:.4f}s (baseline {baseline[stage]:.4f}s)"
+                )
+        return regressions
+
+    def check(self, name: str) -> None:
+        """Fail the test when a stage of the named benchmark regressed."""
+        if regressions := self.regressions(name):
+            pytest.fail("\n".join(regressions))
+
+
+@pytest.fixture(scope="session")
+def config_benchmark(request: pytest.FixtureRequest) -> Generator[ConfigBenchmark]:
+    """Fixture to record benchmark timings and compare with the baseline."""
+    benchmark = ConfigBenchmark(
+        _load_baseline(),
+        request.config.getoption("update_benchmarks"),
+        request.config.getoption("check_benchmarks"),
+    )
+    yield benchmark
+    if benchmark.update and benchmark.results:
+        # Merge with the file on disk, other workers may have written results
+        results = _load_baseline()
+        results.update(benchmark.results)
+        BASELINE_FILE.write_text(
+            json.dumps(dict(sorted(results.items())), indent=2) + "\n"
+        )
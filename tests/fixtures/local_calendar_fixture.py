@@ -1,61 +1,120 @@
-"""Fixtures for setting up a local calendar store."""
+"""Fixtures for setting up a local calendar store.
 
+Calendars are stored in memory, keyed by their storage key (for example
+`personal`). Tests that need a busy calendar seed it in one step before the
+calendar is set up, either by overriding the `calendar_events` fixture or by
+calling `CalendarStorage.seed_ics` with an existing ICS document.
+"""
+
+import datetime
 import pathlib
-from collections.abc import Generator
-from unittest.mock import Mock, patch
+from collections.abc import Generator, Iterable
+from unittest.mock import patch
 
 import pytest
 from homeassistant.components.local_calendar.store import LocalCalendarStore
 from homeassistant.config_entries import ConfigEntryState
 from homeassistant.core import HomeAssistant
+from ical.calendar import Calendar
+from ical.calendar_stream import IcsCalendarStream
+from ical.event import Event
 from pytest_homeassistant_custom_component.common import (
     MockConfigEntry,
 )
 
+CALENDAR_KEY = "personal"
+
 
-class FakeStore(LocalCalendarStore):
-    """Mock storage implementation."""
+class MemoryStore(LocalCalendarStore):
+    """Local calendar storage backed by a dictionary."""
 
     def __init__(
-        self,
-        hass: HomeAssistant,
-        path: pathlib.Path,
+        self, hass: HomeAssistant, path: pathlib.Path, contents: dict[str, str]
     ) -> None:
-        """Initialize FakeStore."""
+        """Initialize MemoryStore."""
         super().__init__(hass, path)
-        mock_path = self._mock_path = Mock()
-        mock_path.exists = self._mock_exists
-        mock_path.read_text = Mock()
-        mock_path.read_text.return_value = ""
-        mock_path.write_text = self._mock_write_text
-        super().__init__(hass, mock_path)
+        # The store path is `.storage/local_calendar.<key>.ics`
+        self._key = path.stem.removeprefix("local_calendar.")
+        self._contents = contents
 
-    def _mock_exists(self) -> bool:
-        return self._mock_path.read_text.return_value is not None
+    async def async_load(self) -> str:
+        """Load the calendar from memory."""
+        return self._contents.get(self._key, "")
 
-    def _mock_write_text(self, content: str) -> None:
-        self._mock_path.read_text.return_value = content
+    async def async_store(self, ics_content: str) -> None:
+        """Persist the calendar to memory."""
+        self._contents[self._key] = ics_content
 
 
-@pytest.fixture(name="store", autouse=True)
-def mock_store() -> Generator[None]:
-    """Test cleanup, remove any media storage persisted during the test."""
+class CalendarStorage:
+    """Contents of every local calendar created during a test."""
+
+    def __init__(self) -> None:
+        """Initialize CalendarStorage."""
+        self.contents: dict[str, str] = {}
+
+    def new_store(self, hass: HomeAssistant, path: pathlib.Path) -> MemoryStore:
+        """Create the store for a local calendar config entry."""
+        return MemoryStore(hass, path, self.contents)
+
+    def seed_ics(self, key: str, ics: str) -> None:
+        """Replace the contents of a calendar with an ICS document."""
+        self.contents[key] = ics
 
-    def new_store(hass: HomeAssistant, path: pathlib.Path) -> FakeStore:
-        # Single fake store
-        return FakeStore(hass, path)
+    def seed_events(self, key: str, events: Iterable[Event]) -> None:
+        """Replace the contents of a calendar with the events."""
+        self.seed_ics(
+            key, IcsCalendarStream.calendar_to_ics(Calendar(events=list(events)))
+        )
 
+
+def generate_events(
+    count: int,
+    start: datetime.datetime,
+    interval: datetime.timedelta,
+    duration: datetime.timedelta = datetime.timedelta(minutes=30),
+    description: str | None = None,
+) -> list[Event]:
+    """Return events spaced evenly from the start, every other one with a location."""
+    start = start.replace(microsecond=0)
+    return [
+        Event(
+            summary=f"Event {i}",
+            start=start + interval * i,
+            end=start + interval * i + duration,
+            location=f"Location {i}" if i % 2 else None,
+            description=description,
+        )
+        for i in range(count)
+    ]
+
+
+@pytest.fixture(name="store", autouse=True)
+def mock_store() -> Generator[CalendarStorage]:
+    """Fixture to keep local calendar contents in memory."""
+    storage = CalendarStorage()
     with patch(
-        "homeassistant.components.local_calendar.LocalCalendarStore", new=new_store
+        "homeassistant.components.local_calendar.LocalCalendarStore",
+        new=storage.new_store,
     ):
-        yield
+        yield storage
+
+
+@pytest.fixture(name="calendar_events")
+def mock_calendar_events() -> list[Event]:
+    """Fixture for the events on the calendar when it is set up."""
+    return []
 
 
 @pytest.fixture(name="calendar")
-async def mock_calendar(hass: HomeAssistant) -> MockConfigEntry:
+async def mock_calendar(
+    hass: HomeAssistant, store: CalendarStorage, calendar_events: list[Event]
+) -> MockConfigEntry:
     """Mock the local calendar."""
+    if calendar_events:
+        store.seed_events(CALENDAR_KEY, calendar_events)
     config_entry = MockConfigEntry(
-        domain="local_calendar", data={"calendar_name": "personal"}
+        domain="local_calendar", data={"calendar_name": CALENDAR_KEY}
     )
     config_entry.add_to_hass(hass)
     await hass.config_entries.async_setup(config_entry.entry_id)
@@ -0,0 +1,147 @@
+"""Fixtures for a local stand-in of the mobile app push notification gateway.
+
+The `push_gateway` fixture runs an aiohttp server on localhost that accepts
+push notifications the same way the mobile app push gateway does. It records
+the connections opened, the requests sent on each connection, the request
+sizes and the time spent serving each request. Tests can add a fixed
+`delay` to each request to model the cost of a remote gateway.
+
+The `aioclient_mock` fixture replaces every client session, so the
+`push_session` fixture gives the mobile_app notify platform a real Home
+Assistant client session. That session shares Home Assistant's connection pool.
+"""
+
+import asyncio
+import json
+import statistics
+import time
+from collections import Counter
+from collections.abc import AsyncGenerator, Callable
+from dataclasses import dataclass, field
+from typing import Any
+from unittest.mock import patch
+
+import aiohttp
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import aiohttp_client
+from yarl import URL
+
+PUSH_PATH = "/push"
+PUSH_RESPONSE = {
+    "rateLimits": {
+        "attempts": 1,
+        "successful": 1,
+        "errors": 0,
+        "total": 1,
+        "maximum": 150,
+        "remaining": 149,
+        "resetsAt": "2024-01-01T00:00:00Z",
+    }
+}
+
+# Captured before `aioclient_mock` replaces it with a mocked session
+_async_create_clientsession = aiohttp_client._async_create_clientsession
+
+
+@dataclass
+class PushGatewayStats:
+    """Connection and throughput metrics recorded by the push gateway."""
+
+    requests_per_connection: Counter[Any] = field(default_factory=Counter)
+    request_sizes: list[int] = field(default_factory=list)
+    service_times: list[float] = field(default_factory=list)
+
+    @property
+    def requests(self) -> int:
+        """Return the number of requests served."""
+        return len(self.request_sizes)
+
+    @property
+    def connections(self) -> int:
+        """Return the number of connections opened by clients."""
+        return len(self.requests_per_connection)
+
+    def __str__(self) -> str:
+        """Summarize the connection reuse, payload size and service time."""
+        if not self.requests:
+            return "requests=0"
+        return (
+            f"requests={self.requests} connections={self.connections} "
+            f"requests/connection={self.requests / self.connections:.1f} "
+            f"request_bytes(mean={statistics.mean(self.request_sizes):.0f} "
+            f"max={max(self.request_sizes)}) "
+            f"service_ms(p50={statistics.median(self.service_times) * 1000:.2f} "
+            f"max={max(self.service_times) * 1000:.2f})"
+        )
+
+
+class PushGateway:
+    """Local server that accepts mobile app push notifications."""
+
+    def __init__(self, server: TestServer) -> None:
+        """Initialize PushGateway."""
+        self._server = server
+        self.stats = PushGatewayStats()
+        self.payloads: list[dict[str, Any]] = []
+        self.delay = 0.0
+        self.on_push: Callable[[dict[str, Any]], None] | None = None
+
+    @property
+    def url(self) -> URL:
+        """Return the URL that push notifications are sent to."""
+        return self._server.make_url(PUSH_PATH)
+
+    async def handle_push(self, request: web.Request) -> web.Response:
+        """Record a push notification and reply like the gateway."""
+        start = time.perf_counter()
+        body = await request.read()
+        payload = json.loads(body)
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        self.payloads.append(payload)
+        if self.on_push is not None:
+            self.on_push(payload)
+        # Each connection has its own client address and port
+        assert request.transport is not None
+        self.stats.requests_per_connection[
+            request.transport.get_extra_info("peername")
+        ] += 1
+        self.stats.request_sizes.append(len(body))
+        self.stats.service_times.append(time.perf_counter() - start)
+        return web.json_response(PUSH_RESPONSE, status=201)
+
+
+@pytest.fixture(name="push_gateway")
+async def mock_push_gateway(socket_enabled: None) -> AsyncGenerator[PushGateway]:
+    """Fixture to run a local push notification gateway."""
+    app = web.Application()
+    server = TestServer(app, host="127.0.0.1")
+    gateway = PushGateway(server)
+    app.router.add_post(PUSH_PATH, gateway.handle_push)
+    await server.start_server()
+    yield gateway
+    await server.close()
+
+
+@pytest.fixture(name="push_session")
+async def mock_push_session(hass: HomeAssistant) -> AsyncGenerator[None]:
+    """Fixture to send mobile app push notifications over the network."""
+    session: aiohttp.ClientSession | None = None
+
+    def get_session(hass: HomeAssistant, *args: Any, **kwargs: Any) -> Any:
+        nonlocal session
+        if session is None:
+            session = _async_create_clientsession(hass)
+        return session
+
+    with patch(
+        "homeassistant.components.mobile_app.notify.async_get_clientsession",
+        side_effect=get_session,
+    ):
+        yield
+    if session is not None:
+        # The connector is shared with Home Assistant and closed when it stops
+        session.detach()
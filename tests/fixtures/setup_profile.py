@@ -0,0 +1,265 @@
+"""Profile the time spent setting up fixtures and integrations.
+
+Every run records the setup and teardown time of each fixture and the time
+spent in each integration's `async_setup_component`, attributed to the fixture
+(or test) that was running. At the end of the run the slowest fixtures are
+printed and two files are written to the pytest cache directory:
+
+- `setup_profile/report.txt`: fixtures and integrations sorted by total time
+- `setup_profile/setup.collapsed`: collapsed stacks (`fixture;integration us`)
+  that can be rendered with `flamegraph.pl` or speedscope
+
+When the suite runs across workers (`-n auto`) each worker stores its results
+and the controller merges them.
+"""
+
+import json
+import pathlib
+import time
+from collections import defaultdict
+from collections.abc import Generator
+from contextvars import ContextVar, Token
+from dataclasses import dataclass, field
+from typing import Any
+from unittest.mock import patch
+
+import pytest
+from _pytest.terminal import TerminalReporter
+from homeassistant import setup
+from homeassistant.core import HomeAssistant
+
+CACHE_DIR = "setup_profile"
+REPORT_FILE = "report.txt"
+COLLAPSED_FILE = "setup.collapsed"
+TEST_CALL = "<test>"
+SUMMARY_LIMIT = 10
+
+
+@dataclass
+class _Frame:
+    """A fixture or integration setup in progress."""
+
+    stack: tuple[str, ...]
+    start: float
+    parent: "_Frame | None"
+    children: float = 0.0
+
+
+_current_frame: ContextVar[_Frame | None] = ContextVar(
+    "setup_profile_frame", default=None
+)
+
+
+@dataclass
+class SetupProfile:
+    """Setup and teardown time of fixtures and integrations."""
+
+    # Fixture name to [setup seconds, teardown seconds, count]
+    fixtures: dict[str, list[float]] = field(
+        default_factory=lambda: defaultdict(lambda: [0.0, 0.0, 0])
+    )
+    # Integration domain to [setup seconds, count]
+    integrations: dict[str, list[float]] = field(
+        default_factory=lambda: defaultdict(lambda: [0.0, 0])
+    )
+    # Collapsed stack to self time in seconds
+    stacks: dict[str, float] = field(default_factory=lambda: defaultdict(float))
+
+    def enter(self, name: str) -> tuple[_Frame, Token[_Frame | None]]:
+        """Start timing a frame nested in the current one."""
+        parent = _current_frame.get()
+        frame = _Frame(
+            (parent.stack if parent else ()) + (name,), time.perf_counter(), parent
+        )
+        return frame, _current_frame.set(frame)
+
+    def exit(self, frame: _Frame, token: Token[_Frame | None]) -> float:
+        """Finish timing a frame and return its elapsed time."""
+        elapsed = time.perf_counter() - frame.start
+        _current_frame.reset(token)
+        if frame.parent is not None:
+            frame.parent.children += elapsed
+        # Dependencies may be set up concurrently, so children can overlap
+        self.stacks[";".join(frame.stack)] += max(elapsed - frame.children, 0.0)
+        return elapsed
+
+    def merge(self, data: dict[str, Any]) -> None:
+        """Add the results stored by another process."""
+        for name, (setup_time, teardown, count) in data["fixtures"].items():
+            totals = self.fixtures[name]
+            totals[0] += setup_time
+            totals[1] += teardown
+            totals[2] += count
+        for domain, (setup_time, count) in data["integrations"].items():
+            totals = self.integrations[domain]
+            totals[0] += setup_time
+            totals[1] += count
+        for stack, elapsed in data["stacks"].items():
+            self.stacks[stack] += elapsed
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the results in a form that can be stored as JSON."""
+        return {
+            "fixtures": dict(self.fixtures),
+            "integrations": dict(self.integrations),
+            "stacks": dict(self.stacks),
+        }
+
+    def sorted_fixtures(self) -> list[tuple[str, list[float]]]:
+        """Return fixtures with the most setup and teardown time first."""
+        return sorted(
+            self.fixtures.items(), key=lambda item: -(item[1][0] + item[1][1])
+        )
+
+    def sorted_integrations(self) -> list[tuple[str, list[float]]]:
+        """Return integrations with the most setup time first."""
+        return sorted(self.integrations.items(), key=lambda item: -item[1][0])
+
+    def report(self) -> str:
+        """Return the fixtures and integrations sorted by time."""
+        width = max(
+            (len(name) for name in [*self.fixtures, *self.integrations]), default=0
+        )
+        lines = [f"{'fixture':<{width}}  {'setup':>9}  {'teardown':>9}  {'count':>6}"]
+        lines.extend(
+            f"{name:<{width}}  {setup_time:>8.3f}s  {teardown:>8.3f}s  {count:>6}"
+            for name, (setup_time, teardown, count) in self.sorted_fixtures()
+        )
+        lines.append("")
+        lines.append(f"{'integration':<{width}}  {'setup':>9}  {'count':>6}")
+        lines.extend(
+            f"{domain:<{width}}  {setup_time:>8.3f}s  {count:>6}"
+            for domain, (setup_time, count) in self.sorted_integrations()
+        )
+        return "\n".join(lines) + "\n"
+
+    def collapsed(self) -> str:
+        """Return the stacks in collapsed format with microsecond counts."""
+        return "".join(
+            f"{stack} {round(elapsed * 1_000_000)}\n"
+            for stack, elapsed in sorted(self.stacks.items())
+            if elapsed > 0
+        )
+
+
+class SetupProfiler:
+    """Records fixture and integration setup time during the run."""
+
+    def __init__(self, config: pytest.Config) -> None:
+        """Initialize SetupProfiler."""
+        self._config = config
+        self.profile = SetupProfile()
+        self._teardown_start: dict[int, float] = {}
+        self._setup_component = setup._async_setup_component
+        self._patch: Any = None
+
+    @property
+    def _cache_dir(self) -> pathlib.Path | None:
+        """Return the directory for the results, if the cache is enabled."""
+        if (cache := getattr(self._config, "cache", None)) is None:
+            return None
+        return cache.mkdir(CACHE_DIR)
+
+    @property
+    def _worker_id(self) -> str:
+        """Return the name of this process for its stored results."""
+        if (workerinput := getattr(self._config, "workerinput", None)) is not None:
+            return workerinput["workerid"]
+        return "main"
+
+    async def _async_setup_component(
+        self, hass: HomeAssistant, domain: str, config: Any
+    ) -> bool:
+        """Time an integration setup."""
+        frame, token = self.profile.enter(f"setup {domain}")
+        try:
+            return await self._setup_component(hass, domain, config)
+        finally:
+            elapsed = self.profile.exit(frame, token)
+            totals = self.profile.integrations[domain]
+            totals[0] += elapsed
+            totals[1] += 1
+
+    def pytest_sessionstart(self) -> None:
+        """Start timing integration setups and clear stale results."""
+        if not hasattr(self._config, "workerinput") and (cache_dir := self._cache_dir):
+            for path in cache_dir.glob("*.json"):
+                path.unlink()
+        self._patch = patch.object(
+            setup, "_async_setup_component", self._async_setup_component
+        )
+        self._patch.start()
+
+    @pytest.hookimpl(wrapper=True)
+    def pytest_fixture_setup(
+        self, fixturedef: pytest.FixtureDef[Any], request: pytest.FixtureRequest
+    ) -> Generator[None, Any, Any]:
+        """Time a fixture setup and start timing its teardown first."""
+        frame, token = self.profile.enter(fixturedef.argname)
+        try:
+            return (yield)
+        finally:
+            totals = self.profile.fixtures[fixturedef.argname]
+            totals[0] += self.profile.exit(frame, token)
+            totals[2] += 1
+            # Finalizers run last in first out, so this runs before the teardown
+            key = id(fixturedef)
+            fixturedef.addfinalizer(
+                lambda: self._teardown_start.__setitem__(key, time.perf_counter())
+            )
+
+    def pytest_fixture_post_finalizer(
+        self, fixturedef: pytest.FixtureDef[Any], request: pytest.FixtureRequest
+    ) -> None:
+        """Record the teardown time of a fixture."""
+        if (start := self._teardown_start.pop(id(fixturedef), None)) is None:
+            return
+        elapsed = time.perf_counter() - start
+        self.profile.fixtures[fixturedef.argname][1] += elapsed
+        self.profile.stacks[f"{fixturedef.argname} (teardown)"] += elapsed
+
+    @pytest.hookimpl(wrapper=True)
+    def pytest_runtest_call(self, item: pytest.Item) -> Generator[None, Any, Any]:
+        """Attribute integrations set up by the test itself."""
+        frame, token = self.profile.enter(TEST_CALL)
+        try:
+            return (yield)
+        finally:
+            self.profile.exit(frame, token)
+
+    def pytest_sessionfinish(self) -> None:
+        """Store the results of this process."""
+        if self._patch is not None:
+            self._patch.stop()
+        if (cache_dir := self._cache_dir) is None or not self.profile.fixtures:
+            return
+        (cache_dir / f"{self._worker_id}.json").write_text(
+            json.dumps(self.profile.as_dict())
+        )
+
+    def pytest_terminal_summary(self, terminalreporter: TerminalReporter) -> None:
+        """Merge the results of every process, write the report and print it."""
+        if (cache_dir := self._cache_dir) is None:
+            return
+        profile = SetupProfile()
+        for path in sorted(cache_dir.glob("*.json")):
+            profile.merge(json.loads(path.read_text()))
+        if not profile.fixtures:
+            return
+        (cache_dir / REPORT_FILE).write_text(profile.report())
+        (cache_dir / COLLAPSED_FILE).write_text(profile.collapsed())
+
+        terminalreporter.write_sep("=", "slowest fixtures (setup + teardown)")
+        for name, (setup_time, teardown, count) in profile.sorted_fixtures()[
+            :SUMMARY_LIMIT
+        ]:
+            terminalreporter.write_line(
+                f"{setup_time + teardown:8.3f}s {name} "
+                f"(setup {setup_time:.3f}s, teardown {teardown:.3f}s, {count}x)"
+            )
+        terminalreporter.write_line(f"Full report in {cache_dir / REPORT_FILE}")
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    """Register the setup profiler."""
+    config.pluginmanager.register(SetupProfiler(config), "setup_profile")
@@ -0,0 +1,117 @@
+"""Balance tests across pytest-xdist workers using recorded durations.
+
+Run with `--store-durations` to record how long each test takes into
+`tests/test_durations.json`. When the suite runs across workers (`-n auto`)
+the tests are ordered longest first so that the slow tests are started early
+and the short tests fill in the gaps at the end of the run. Tests without a
+recorded duration are assumed to take the average time.
+
+The durations depend on the machine, so they are not committed. Record them
+with `script/test --parallel --store-durations` on the machine that runs the
+suite. CI records them on every run and caches the file from runs on main for
+the next run. Without the file the tests keep their collection order and are
+handed out by `--dist load` as workers become free, and the run prints a
+reminder.
+
+The controller prints the merged time spent on each worker at the end of the
+run so an unbalanced split is easy to spot.
+"""
+
+import json
+import pathlib
+from collections import defaultdict
+
+import pytest
+from _pytest.terminal import TerminalReporter
+
+DURATIONS_FILE = pathlib.Path(__file__).parent.parent / "test_durations.json"
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    """Register the option for recording test durations."""
+    parser.addoption(
+        "--store-durations",
+        action="store_true",
+        default=False,
+        help=f"Record the duration of each test in {DURATIONS_FILE.name}.",
+    )
+
+
+def _is_worker(config: pytest.Config) -> bool:
+    """Return True when running inside a pytest-xdist worker."""
+    return hasattr(config, "workerinput")
+
+
+def _load_durations() -> dict[str, float]:
+    """Load the recorded durations, if any."""
+    if not DURATIONS_FILE.exists():
+        return {}
+    return json.loads(DURATIONS_FILE.read_text())
+
+
+class ShardBalance:
+    """Orders tests by recorded duration and reports time spent per worker."""
+
+    def __init__(self, config: pytest.Config) -> None:
+        """Initialize ShardBalance."""
+        self._config = config
+        self.durations: dict[str, float] = defaultdict(float)
+        self.workers: dict[str, float] = defaultdict(float)
+        self.worker_tests: dict[str, int] = defaultdict(int)
+
+    def pytest_collection_modifyitems(self, items: list[pytest.Item]) -> None:
+        """Order tests longest first when running across workers."""
+        if not _is_worker(self._config):
+            return
+        if not (recorded := _load_durations()):
+            # Nothing to balance with, keep the collection order
+            return
+        default = sum(recorded.values()) / len(recorded)
+        # Stable sort so every worker produces the same collection order
+        items.sort(key=lambda item: -recorded.get(item.nodeid, default))
+
+    def pytest_runtest_logreport(self, report: pytest.TestReport) -> None:
+        """Record the duration of each test and the worker it ran on."""
+        self.durations[report.nodeid] += report.duration
+        if (node := getattr(report, "node", None)) is not None:
+            worker_id = node.gateway.id
+            self.workers[worker_id] += report.duration
+            if report.when == "call":
+                self.worker_tests[worker_id] += 1
+
+    def pytest_sessionfinish(self) -> None:
+        """Write the recorded durations when requested."""
+        if (
+            _is_worker(self._config)
+            or not self._config.getoption("store_durations")
+            or not self.durations
+        ):
+            return
+        durations = _load_durations()
+        durations.update(
+            {nodeid: round(duration, 3) for nodeid, duration in self.durations.items()}
+        )
+        DURATIONS_FILE.write_text(
+            json.dumps(dict(sorted(durations.items())), indent=2) + "\n"
+        )
+
+    def pytest_terminal_summary(self, terminalreporter: TerminalReporter) -> None:
+        """Report the time spent on each worker."""
+        if not self.workers:
+            return
+        terminalreporter.write_sep("=", "worker durations")
+        if not DURATIONS_FILE.exists():
+            terminalreporter.write_line(
+                f"No {DURATIONS_FILE.name}, tests ran in collection order. Record "
+                "durations with `script/test --parallel --store-durations`."
+            )
+        for worker_id in sorted(self.workers):
+            terminalreporter.write_line(
+                f"{worker_id}: {self.workers[worker_id]:.2f}s "
+                f"({self.worker_tests[worker_id]} tests)"
+            )
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    """Register the shard balancer."""
+    config.pluginmanager.register(ShardBalance(config), "shard_balance")
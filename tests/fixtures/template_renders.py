@@ -0,0 +1,168 @@
+"""Fixture that counts and times template renders for each template entity.
+
+The `template_renders` fixture wraps `Template.async_render`, which both
+tracked template entities and trigger template entities use, and records the
+render count, total time and worst case for every template. Renders are
+attributed to the template entity and the attribute (e.g. `state`,
+`attributes.forecast`) that owns the template. Renders of other templates,
+such as script variables, are reported as unattributed.
+
+Tests enforce a render budget with `over_budget`, which describes each
+attribute rendered more times than allowed:
+
+    assert not template_renders.over_budget({"sensor.next_location": 2})
+"""
+
+import logging
+import time
+from collections.abc import Generator, Mapping
+from dataclasses import dataclass
+from typing import Any
+from unittest.mock import patch
+
+import pytest
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.entity_platform import async_get_platforms
+from homeassistant.helpers.template import Template
+
+_LOGGER = logging.getLogger(__name__)
+
+UNATTRIBUTED = "<unattributed>"
+
+
+@dataclass
+class RenderStats:
+    """Render count and time of one or more templates."""
+
+    count: int = 0
+    total: float = 0.0
+    worst: float = 0.0
+
+    def add(self, elapsed: float) -> None:
+        """Record the time of a render."""
+        self.count += 1
+        self.total += elapsed
+        self.worst = max(self.worst, elapsed)
+
+    def merge(self, other: "RenderStats") -> None:
+        """Add the renders recorded by another template."""
+        self.count += other.count
+        self.total += other.total
+        self.worst = max(self.worst, other.worst)
+
+    def __str__(self) -> str:
+        """Summarize the render count and time."""
+        return (
+            f"renders={self.count} total_ms={self.total * 1000:.2f} "
+            f"worst_ms={self.worst * 1000:.2f}"
+        )
+
+
+def _template_owners(hass: HomeAssistant) -> dict[int, tuple[str, str]]:
+    """Return the entity and attribute of each template entity template."""
+    owners: dict[int, tuple[str, str]] = {}
+    for platform in async_get_platforms(hass, "template"):
+        for entity_id, entity in platform.entities.items():
+            # Template entities updated by tracking the template result
+            for template, attributes in getattr(entity, "_template_attrs", {}).items():
+                for attribute in attributes:
+                    owners[id(template)] = (
+                        entity_id,
+                        attribute._attribute.removeprefix("_attr_"),
+                    )
+            # Template entities updated when their trigger fires
+            config = getattr(entity, "_config", {})
+            for key, value in config.items():
+                if isinstance(value, Template):
+                    owners[id(value)] = (entity_id, key)
+            for attr, value in config.get("attributes", {}).items():
+                if isinstance(value, Template):
+                    owners[id(value)] = (entity_id, f"attributes.{attr}")
+    return owners
+
+
+class TemplateRenders:
+    """Records the renders of each template."""
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize TemplateRenders."""
+        self._hass = hass
+        # Keyed by identity since templates with the same text compare equal
+        self._renders: dict[int, tuple[Template, RenderStats]] = {}
+
+    def record(self, template: Template, elapsed: float) -> None:
+        """Record a render of the template."""
+        if (entry := self._renders.get(id(template))) is None:
+            entry = self._renders[id(template)] = (template, RenderStats())
+        entry[1].add(elapsed)
+
+    def reset(self) -> None:
+        """Forget the renders recorded so far."""
+        self._renders.clear()
+
+    @property
+    def attributes(self) -> dict[str, dict[str, RenderStats]]:
+        """Return the renders of each attribute, keyed by entity id."""
+        owners = _template_owners(self._hass)
+        results: dict[str, dict[str, RenderStats]] = {}
+        for key, (_, stats) in self._renders.items():
+            entity_id, attribute = owners.get(key, (UNATTRIBUTED, UNATTRIBUTED))
+            results.setdefault(entity_id, {}).setdefault(
+                attribute, RenderStats()
+            ).merge(stats)
+        return results
+
+    @property
+    def entities(self) -> dict[str, RenderStats]:
+        """Return the renders of all attributes of each entity."""
+        results: dict[str, RenderStats] = {}
+        for entity_id, attributes in self.attributes.items():
+            entity_stats = results[entity_id] = RenderStats()
+            for stats in attributes.values():
+                entity_stats.merge(stats)
+        return results
+
+    def over_budget(self, budgets: Mapping[str, int]) -> list[str]:
+        """Return a description of each attribute rendered more than its budget."""
+        attributes = self.attributes
+        return [
+            f"{entity_id} {attribute}: {stats} (budget {budget})"
+            for entity_id, budget in budgets.items()
+            for attribute, stats in attributes.get(entity_id, {}).items()
+            if stats.count > budget
+        ]
+
+    def report(self) -> str:
+        """Return the renders of each entity and attribute, most time first."""
+        attributes = self.attributes
+        lines = []
+        for entity_id, entity_stats in sorted(
+            self.entities.items(), key=lambda item: -item[1].total
+        ):
+            lines.append(f"{entity_id}: {entity_stats}")
+            lines.extend(
+                f"  {attribute}: {stats}"
+                for attribute, stats in sorted(
+                    attributes[entity_id].items(), key=lambda item: -item[1].total
+                )
+            )
+        return "\n".join(lines)
+
+
+@pytest.fixture(name="template_renders")
+def mock_template_renders(hass: HomeAssistant) -> Generator[TemplateRenders]:
+    """Fixture to count and time the renders of each template entity."""
+    renders = TemplateRenders(hass)
+    async_render = Template.async_render
+
+    def timed_render(template: Template, *args: Any, **kwargs: Any) -> Any:
+        start = time.perf_counter()
+        try:
+            return async_render(template, *args, **kwargs)
+        finally:
+            renders.record(template, time.perf_counter() - start)
+
+    # Tracked templates render through `async_render_to_info`, which calls this
+    with patch.object(Template, "async_render", timed_render):
+        yield renders
+    _LOGGER.info("Template renders:\n%s", renders.report())
@@ -6,40 +6,29 @@ import pathlib
 from typing import Any
 
 import pytest
-import yaml
-from homeassistant.config_entries import ConfigEntryState
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers import intent
 from homeassistant.setup import async_setup_component
 from homeassistant.util import dt as dt_util
-from pytest_homeassistant_custom_component.common import (
-    MockConfigEntry,
-)
+from ical.event import Event
+
+from tests.fixtures.config_benchmark import ConfigBenchmark
+from tests.fixtures.local_calendar_fixture import generate_events
+from tests.yaml_loader import load_config
 
 _LOGGER = logging.getLogger(__name__)
 
 
 SCRIPT_YAML = pathlib.Path("config/intent_scripts/todays_agenda.yaml")
 CALENDAR_ENTITY = "calendar.personal"
-
-
-@pytest.fixture(name="calendar")
-async def mock_demo(hass: HomeAssistant) -> MockConfigEntry:
-    config_entry = MockConfigEntry(
-        domain="local_calendar", data={"calendar_name": "personal"}
-    )
-    config_entry.add_to_hass(hass)
-    await hass.config_entries.async_setup(config_entry.entry_id)
-    assert config_entry.state == ConfigEntryState.LOADED
-    return config_entry
+AGENDA_EVENT_COUNTS = [10, 100, 1_000]
+# Seeded events all start within the 18 hour agenda window
+AGENDA_SPAN = datetime.timedelta(hours=17)
 
 
 @pytest.fixture(name="script")
 async def mock_script(hass: HomeAssistant) -> None:
-    with SCRIPT_YAML.open("r") as fd:
-        content = fd.read()
-        config = yaml.load(content, Loader=yaml.Loader)
-
+    config = load_config(SCRIPT_YAML)
     assert await async_setup_component(hass, "intent_script", {"intent_script": config})
     await hass.async_block_till_done()
     await hass.async_block_till_done()
@@ -159,3 +148,40 @@ async def test_event_starting_now(
   Starts in: 0 hours, 0 minutes, lasts 0:30:00 (h:mm:ss).
   Location: Test Location"""
     )
+
+
+@pytest.fixture(name="calendar_events")
+def mock_calendar_events(request: pytest.FixtureRequest) -> list[Event]:
+    """Fixture to seed the calendar with a parametrized number of events."""
+    if not (event_count := getattr(request, "param", 0)):
+        return []
+    return generate_events(
+        event_count,
+        dt_util.now() + datetime.timedelta(minutes=5),
+        AGENDA_SPAN / event_count,
+    )
+
+
+@pytest.mark.parametrize("calendar_events", AGENDA_EVENT_COUNTS, indirect=True)
+async def test_agenda_render_benchmark(
+    hass: HomeAssistant,
+    calendar_events: list[Event],
+    calendar: Any,
+    script: Any,
+    config_benchmark: ConfigBenchmark,
+    error_caplog: pytest.LogCaptureFixture,
+) -> None:
+    """Time the agenda intent on a calendar with many events."""
+    event_count = len(calendar_events)
+    name = f"GetTodaysAgenda[{event_count}]"
+    with config_benchmark.measure(name, "handle"):
+        response = await intent.async_handle(hass, "test", "GetTodaysAgenda", {})
+
+    speech = response.speech["plain"]["speech"]
+    assert speech.count("Summary: ") == event_count
+    assert speech.count("Location: ") == event_count // 2
+
+    _LOGGER.info("%s: %s", name, config_benchmark.results[name])
+    config_benchmark.check(name)
+
+    assert not error_caplog.records
@@ -1,26 +1,36 @@
 """Tests for the weather intent scripts."""
 
+import datetime
 import logging
 import pathlib
 from typing import Any
 from unittest.mock import patch
 
 import pytest
-import yaml
+from freezegun import freeze_time
 from homeassistant.config_entries import ConfigEntryState
-from homeassistant.const import Platform
+from homeassistant.const import EVENT_CALL_SERVICE, Platform
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers import intent
 from homeassistant.setup import async_setup_component
+from homeassistant.util import dt as dt_util
 from pytest_homeassistant_custom_component.common import (
     MockConfigEntry,
+    async_capture_events,
+    async_fire_time_changed,
 )
 
+from tests.fixtures.config_benchmark import ConfigBenchmark
+from tests.yaml_loader import load_config
+
 _LOGGER = logging.getLogger(__name__)
 
 
 SCRIPT_YAML = pathlib.Path("config/intent_scripts/weather_forecast.yaml")
 TEST_WEATHER_ENTITY = "weather.demo_weather_north"
+WEATHER_FORECAST_YAML = pathlib.Path("config/templates/weather_forecast.yaml")
+FORECAST_ENTITY = "sensor.woodgreen_hourly_forecast"
+INTENT_ITERATIONS = 20
 
 
 @pytest.fixture(name="weather")
@@ -38,11 +48,7 @@ async def mock_weather_demo(hass: HomeAssistant) -> MockConfigEntry:
 
 @pytest.fixture(name="script")
 async def mock_script(hass: HomeAssistant) -> None:
-    with SCRIPT_YAML.open("r") as fd:
-        content = fd.read()
-        content = content.replace("weather.woodgreen", TEST_WEATHER_ENTITY)
-        config = yaml.load(content, Loader=yaml.Loader)
-
+    config = load_config(SCRIPT_YAML, {"weather.woodgreen": TEST_WEATHER_ENTITY})
     assert await async_setup_component(hass, "intent_script", {"intent_script": config})
     await hass.async_block_till_done()
     await hass.async_block_till_done()
@@ -57,3 +63,61 @@ async def test_get_weather_forecast(
     """Exercise the weather summary."""
     response = await intent.async_handle(hass, "test", "GetWeatherForecast", {})
     assert response.speech["plain"]["speech"] == "sunny (-23.3°C, 2.0% precipitation)"
+
+
+@pytest.fixture(name="forecast_template")
+async def mock_forecast_template(hass: HomeAssistant, weather: Any) -> None:
+    """Fixture to set up the forecast display that keeps the hourly forecast."""
+    config = load_config(
+        WEATHER_FORECAST_YAML, {"weather.woodgreen": TEST_WEATHER_ENTITY}
+    )
+    assert await async_setup_component(hass, "template", {"template": config})
+    await hass.async_block_till_done()
+
+
+@pytest.mark.parametrize(("expected_lingering_timers"), [True])
+async def test_get_weather_forecast_cached_benchmark(
+    hass: HomeAssistant,
+    forecast_template: Any,
+    script: Any,
+    config_benchmark: ConfigBenchmark,
+    error_caplog: pytest.LogCaptureFixture,
+) -> None:
+    """Compare answering from the cached hourly forecast with a live fetch."""
+    service_calls = async_capture_events(hass, EVENT_CALL_SERVICE)
+
+    def fetch_count() -> int:
+        return sum(
+            1
+            for event in service_calls
+            if event.data["domain"] == "weather"
+            and event.data["service"] == "get_forecasts"
+        )
+
+    name = "GetWeatherForecast"
+    # The hourly forecast has not been fetched yet, so every answer is live
+    assert hass.states.get(FORECAST_ENTITY) is None
+    with config_benchmark.measure(name, "uncached"):
+        for _ in range(INTENT_ITERATIONS):
+            response = await intent.async_handle(hass, "test", "GetWeatherForecast", {})
+    live_speech = response.speech["plain"]["speech"]
+    assert fetch_count() == INTENT_ITERATIONS
+
+    # The refresh job runs on its next poll
+    next = dt_util.now() + datetime.timedelta(minutes=30)
+    with freeze_time(next):
+        async_fire_time_changed(hass, next)
+        await hass.async_block_till_done()
+    assert hass.states.get(FORECAST_ENTITY)
+    fetches = fetch_count()
+
+    with config_benchmark.measure(name, "cached"):
+        for _ in range(INTENT_ITERATIONS):
+            response = await intent.async_handle(hass, "test", "GetWeatherForecast", {})
+    assert response.speech["plain"]["speech"] == live_speech
+    assert fetch_count() == fetches
+
+    _LOGGER.info("%s: %s", name, config_benchmark.results[name])
+    config_benchmark.check(name)
+
+    assert not error_caplog.records
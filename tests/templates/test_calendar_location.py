@@ -6,14 +6,18 @@ import pathlib
 from typing import Any
 
 import pytest
-import yaml
 from freezegun import freeze_time
-from homeassistant.core import HomeAssistant
+from homeassistant.components.calendar import DATA_COMPONENT
+from homeassistant.const import EVENT_CALL_SERVICE
+from homeassistant.core import Event, HomeAssistant, callback
 from homeassistant.setup import async_setup_component
 from homeassistant.util import dt as dt_util
 from pytest_homeassistant_custom_component.common import (
     async_fire_time_changed,
 )
+from pytest_homeassistant_custom_component.typing import WebSocketGenerator
+
+from tests.yaml_loader import load_config
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -23,10 +27,7 @@ CALENDAR_LOCATION_YAML = pathlib.Path("config/templates/calendar_location.yaml")
 @pytest.fixture(name="template")
 async def mock_template(hass: HomeAssistant, calendar: Any) -> None:
     """Mock the template."""
-    with CALENDAR_LOCATION_YAML.open("r") as fd:
-        content = fd.read()
-        config = yaml.load(content, Loader=yaml.Loader)
-
+    config = load_config(CALENDAR_LOCATION_YAML)
     assert await async_setup_component(hass, "template", {"template": config})
     await hass.async_block_till_done()
 
@@ -78,3 +79,130 @@ async def test_calendar_location_template(
     assert dt_util.parse_datetime(state.state) == start.replace(microsecond=0)
 
     assert not error_caplog.records
+
+
+async def create_event(
+    hass: HomeAssistant, summary: str, location: str, start: datetime.datetime
+) -> None:
+    """Create an event on the personal calendar."""
+    await hass.services.async_call(
+        "calendar",
+        "create_event",
+        {
+            "entity_id": "calendar.personal",
+            "summary": summary,
+            "location": location,
+            "start_date_time": start.isoformat(),
+            "end_date_time": (start + datetime.timedelta(hours=1)).isoformat(),
+        },
+        blocking=True,
+    )
+    await hass.async_block_till_done()
+
+
+@pytest.mark.parametrize(("expected_lingering_timers"), [True])
+async def test_calendar_location_refresh_on_change(
+    hass: HomeAssistant,
+    hass_ws_client: WebSocketGenerator,
+    calendar: Any,
+    template: Any,
+    error_caplog: pytest.LogCaptureFixture,
+) -> None:
+    """Test the sensors follow calendar changes and shrink the fetch window."""
+    fetch_hours: list[float] = []
+
+    @callback
+    def record_fetch(event: Event) -> None:
+        if event.data["domain"] == "calendar" and event.data["service"] == "get_events":
+            fetch_hours.append(event.data["service_data"]["duration"]["hours"])
+
+    hass.bus.async_listen(EVENT_CALL_SERVICE, record_fetch)
+
+    # A new event is shown without waiting for the time pattern
+    now = dt_util.now()
+    gym_start = now + datetime.timedelta(hours=30)
+    await create_event(hass, "Gym", "Gym Location", gym_start)
+
+    state = hass.states.get("sensor.next_location")
+    assert state
+    assert state.state == "Gym Location"
+    assert fetch_hours
+    assert fetch_hours[0] == 168
+    fetches = len(fetch_hours)
+
+    # An earlier event is found within the window up to the known location
+    dentist_start = now + datetime.timedelta(hours=5)
+    await create_event(hass, "Dentist", "Dentist Office", dentist_start)
+
+    state = hass.states.get("sensor.next_location")
+    assert state
+    assert state.state == "Dentist Office"
+    state = hass.states.get("sensor.next_location_start")
+    assert state
+    assert dt_util.parse_datetime(state.state) == dentist_start.replace(microsecond=0)
+    assert 0 < len(fetch_hours) - fetches <= 2
+    assert all(hours < 168 for hours in fetch_hours[fetches:])
+    fetches = len(fetch_hours)
+
+    # Deleting the next location falls back to searching the full window
+    entity = hass.data[DATA_COMPONENT].get_entity("calendar.personal")
+    assert entity
+    events = await entity.async_get_events(
+        hass, dentist_start, dentist_start + datetime.timedelta(hours=1)
+    )
+    assert len(events) == 1
+    client = await hass_ws_client(hass)
+    await client.send_json_auto_id(
+        {
+            "type": "calendar/event/delete",
+            "entity_id": "calendar.personal",
+            "uid": events[0].uid,
+        }
+    )
+    result = await client.receive_json()
+    assert result["success"]
+    await hass.async_block_till_done()
+
+    state = hass.states.get("sensor.next_location")
+    assert state
+    assert state.state == "Gym Location"
+    assert fetch_hours[fetches:] == [6, 168]
+
+    assert not error_caplog.records
+
+
+@pytest.mark.parametrize(("expected_lingering_timers"), [True])
+async def test_calendar_location_event_behind_next_event(
+    hass: HomeAssistant,
+    calendar: Any,
+    template: Any,
+    error_caplog: pytest.LogCaptureFixture,
+) -> None:
+    """Test a located event created behind a next event without a location."""
+    now = dt_util.now()
+    await hass.services.async_call(
+        "calendar",
+        "create_event",
+        {
+            "entity_id": "calendar.personal",
+            "summary": "Lunch",
+            "start_date_time": (now + datetime.timedelta(hours=1)).isoformat(),
+            "end_date_time": (now + datetime.timedelta(hours=2)).isoformat(),
+        },
+        blocking=True,
+    )
+    await hass.async_block_till_done()
+
+    await create_event(hass, "Gym", "Gym Location", now + datetime.timedelta(hours=5))
+    # The calendar state still describes the next event
+    state = hass.states.get("calendar.personal")
+    assert state
+    assert state.attributes["message"] == "Lunch"
+
+    async_fire_time_changed(hass, dt_util.utcnow() + datetime.timedelta(seconds=2))
+    await hass.async_block_till_done()
+    state = hass.states.get("sensor.next_location")
+    assert state
+    assert state.state == "Gym Location"
+
+    assert not error_caplog.records
@@ -3,25 +3,65 @@
 import datetime
 import logging
 import pathlib
+import timeit
 from typing import Any
 from unittest.mock import patch
 
 import pytest
-import yaml
 from freezegun import freeze_time
 from homeassistant.config_entries import ConfigEntryState
-from homeassistant.const import Platform
+from homeassistant.const import EVENT_CALL_SERVICE, Platform
 from homeassistant.core import HomeAssistant
+from homeassistant.helpers.template import Template
 from homeassistant.setup import async_setup_component
+from homeassistant.util import dt as dt_util
 from pytest_homeassistant_custom_component.common import (
     MockConfigEntry,
+    async_capture_events,
     async_fire_time_changed,
 )
 
+from tests.fixtures.template_renders import TemplateRenders
+from tests.yaml_loader import load_config
+
 _LOGGER = logging.getLogger(__name__)
 
 
 WEATHER_FORECAST_YAML = pathlib.Path("config/templates/weather_forecast.yaml")
+DISPLAY_ENTITY = "sensor.woodgreen_forecast_display"
+RENDER_ITERATIONS = 100
+
+# Attribute templates from before the slots were computed in the action stage
+LEGACY_CONDITION_NOW = """
+{% set cond_now = forecast0.condition %}
+{% if states('sun.sun') == 'below_horizon' %}
+    {% if cond_now == 'sunny' %} night {% elif cond_now == 'partlycloudy' %} night-partly-cloudy {% else %} {{ cond_now }} {% endif %}
+{% else %}
+    {{ cond_now }}
+{% endif %}
+"""
+LEGACY_SLOT_TEMPLATES = {
+    "weather_condition_N": """
+{% set cond = forecastN.condition %}
+{% set cond_time = as_timestamp(forecastN.datetime) %}
+{% if cond_time < next_rising and next_rising < next_setting %}
+    {% if cond == 'sunny' %} night {% elif cond == 'partlycloudy' %} night-partly-cloudy {% else %} {{ cond }} {% endif %}
+{% else %}
+    {{ cond }}
+{% endif %}
+""",
+    "weather_temperature_N": "{{ forecastN.temperature | round }}",
+    "weather_timestamp_N": (
+        "{{ as_timestamp(forecastN.datetime) | timestamp_custom('%I') | int }} "
+        "{{ as_timestamp(forecastN.datetime) | timestamp_custom('%p') }}"
+    ),
+}
+FORECAST_CONDITIONS = [
+    ("sunny", -23.3),
+    ("partlycloudy", -25.1),
+    ("rainy", -28.4),
+    ("sunny", -31.0),
+]
 
 
 @pytest.fixture(name="weather")
@@ -39,11 +79,9 @@ async def mock_weather_demo(hass: HomeAssistant) -> MockConfigEntry:
 
 @pytest.fixture(name="template")
 async def mock_template(hass: HomeAssistant) -> None:
-    with WEATHER_FORECAST_YAML.open("r") as fd:
-        content = fd.read()
-        content = content.replace("weather.woodgreen", "weather.demo_weather_north")
-        config = yaml.load(content, Loader=yaml.Loader)
-
+    config = load_config(
+        WEATHER_FORECAST_YAML, {"weather.woodgreen": "weather.demo_weather_north"}
+    )
     assert await async_setup_component(hass, "template", {"template": config})
     await hass.async_block_till_done()
     await hass.async_block_till_done()
@@ -84,3 +122,119 @@ async def test_weather_forecast_template(
     assert state.attributes.get("weather_timestamp_3") == "7 PM"
 
     assert not error_caplog.records
+
+
+@pytest.mark.parametrize(("expected_lingering_timers"), [True])
+async def test_weather_forecast_refresh_on_change(
+    hass: HomeAssistant,
+    weather: Any,
+    template: Any,
+    template_renders: TemplateRenders,
+    error_caplog: pytest.LogCaptureFixture,
+) -> None:
+    """Simulate a day and verify the forecast is fetched and rendered on change."""
+    assert await async_setup_component(hass, "sun", {})
+    await hass.async_block_till_done()
+
+    service_calls = async_capture_events(hass, EVENT_CALL_SERVICE)
+    now = datetime.datetime.now()
+    for minutes in range(5, 24 * 60 + 1, 5):
+        next = now + datetime.timedelta(minutes=minutes)
+        with freeze_time(next):
+            async_fire_time_changed(hass, next)
+            await hass.async_block_till_done()
+
+    fetches = [
+        event
+        for event in service_calls
+        if event.data["domain"] == "weather"
+        and event.data["service"] == "get_forecasts"
+    ]
+    # Polling every minute used to fetch and render 1,440 times a day
+    assert 0 < len(fetches) <= 24 * 2 + 1
+    # The display is only rendered when the forecast payload or sun changes
+    assert DISPLAY_ENTITY in template_renders.entities
+    assert not template_renders.over_budget({DISPLAY_ENTITY: len(fetches) - 1})
+
+    state = hass.states.get(DISPLAY_ENTITY)
+    assert state
+    assert state.state == "OK"
+
+    assert not error_caplog.records
+
+
+async def test_forecast_slot_render_benchmark(hass: HomeAssistant) -> None:
+    """Compare rendering precomputed slots with the per-slot attribute templates."""
+    hass.states.async_set("sun.sun", "below_horizon")
+
+    display = load_config(WEATHER_FORECAST_YAML)[1]
+    step_templates = {
+        key: Template(value, hass)
+        for key, value in display["action"][0]["variables"].items()
+    }
+    attribute_templates = {
+        key: Template(value, hass)
+        for key, value in display["sensor"][0]["attributes"].items()
+        if key != "forecast_slots"
+    }
+    legacy_templates = {"weather_condition_now": Template(LEGACY_CONDITION_NOW, hass)}
+    for slot in range(len(FORECAST_CONDITIONS)):
+        legacy_templates.update(
+            {
+                key.replace("_N", f"_{slot}"): Template(
+                    value.replace("forecastN", f"forecast{slot}"), hass
+                )
+                for key, value in LEGACY_SLOT_TEMPLATES.items()
+            }
+        )
+
+    # The first two slots are before sunrise and are shown as night
+    now = dt_util.now().replace(minute=0, second=0, microsecond=0)
+    forecast = [
+        {
+            "datetime": (now + datetime.timedelta(hours=hour)).isoformat(),
+            "condition": condition,
+            "temperature": temperature,
+        }
+        for hour, (condition, temperature) in enumerate(FORECAST_CONDITIONS)
+    ]
+    run_variables = {
+        "forecast": forecast,
+        "next_rising": (now + datetime.timedelta(hours=2)).timestamp(),
+        "next_setting": (now + datetime.timedelta(hours=12)).timestamp(),
+    }
+    legacy_variables = {
+        **run_variables,
+        **{f"forecast{slot}": item for slot, item in enumerate(forecast)},
+    }
+
+    def render_slots() -> dict[str, Any]:
+        variables = dict(run_variables)
+        for key, template in step_templates.items():
+            if key not in variables:
+                variables[key] = template.async_render(variables)
+        return {
+            key: template.async_render(variables)
+            for key, template in attribute_templates.items()
+        }
+
+    def render_legacy() -> dict[str, Any]:
+        return {
+            key: template.async_render(legacy_variables)
+            for key, template in legacy_templates.items()
+        }
+
+    rendered = render_slots()
+    assert rendered == render_legacy()
+    assert rendered["weather_condition_0"] == "night"
+    assert rendered["weather_condition_1"] == "night-partly-cloudy"
+    assert rendered["weather_condition_3"] == "sunny"
+
+    slots_time = timeit.timeit(render_slots, number=RENDER_ITERATIONS)
+    legacy_time = timeit.timeit(render_legacy, number=RENDER_ITERATIONS)
+    _LOGGER.info(
+        "Rendered %d times: slots %.4fs, legacy %.4fs",
+        RENDER_ITERATIONS,
+        slots_time,
+        legacy_time,
+    )
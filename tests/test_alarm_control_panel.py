@@ -2,38 +2,41 @@
 
 import logging
 import pathlib
+import statistics
+import time
 from typing import Any
 
 import pytest
-import yaml
 from homeassistant.core import HomeAssistant
 from homeassistant.exceptions import HomeAssistantError
 from homeassistant.setup import async_setup_component
 
+from tests.fixtures.template_renders import TemplateRenders
+from tests.yaml_loader import SECRETS, load_config
+
 _LOGGER = logging.getLogger(__name__)
 
 
-SECRET_CODE = "1234"
+SECRET_CODE = SECRETS["alarm_code"]
 
 ALARM_CONTROL_PANEL_YAML = pathlib.Path("config/alarm_control_panel.yaml")
 TEMPLATE_ALARM_YAML = pathlib.Path("config/templates/safe_alarm.yaml")
 HOME_ALARM_ENTITY_ID = "alarm_control_panel.home_alarm"
 TEMPLATE_ALARM_ENTITY_ID = "alarm_control_panel.safe_alarm"
+# Arm and disarm cycles measured through each panel
+ALARM_CYCLES = 20
+# Most extra time the proxy may add to the median transition
+PROXY_LATENCY_BUDGET = 0.01
+# Renders of each proxy template allowed for each transition
+PROXY_RENDER_BUDGET = 1
 
 
 @pytest.fixture(name="alarm_control_panel")
 async def mock_template(hass: HomeAssistant) -> None:
-    with ALARM_CONTROL_PANEL_YAML.open("r") as fd:
-        content = fd.read()
-        content = content.replace("!secret alarm_code", SECRET_CODE)
-        config = yaml.load(content, Loader=yaml.Loader)
-
+    config = load_config(ALARM_CONTROL_PANEL_YAML)
     assert await async_setup_component(hass, "alarm_control_panel", config)
 
-    with TEMPLATE_ALARM_YAML.open("r") as fd:
-        content = fd.read()
-        content = content.replace("!secret alarm_code", SECRET_CODE)
-        template_config = yaml.load(content, Loader=yaml.Loader)
+    template_config = load_config(TEMPLATE_ALARM_YAML)
 
     assert await async_setup_component(hass, "template", {"template": template_config})
     await hass.async_block_till_done()
@@ -172,3 +175,85 @@ async def test_template_control_panel(
     assert state.state == "disarmed"
 
     assert not error_caplog.records
+
+
+async def alarm_transition(
+    hass: HomeAssistant,
+    entity_id: str,
+    service: str,
+    expected_state: str,
+    service_data: dict[str, Any] | None = None,
+) -> float:
+    """Return the time until both panels show the state after the service call."""
+    start = time.perf_counter()
+    await hass.services.async_call(
+        "alarm_control_panel",
+        service,
+        service_data=service_data,
+        blocking=True,
+        target={"entity_id": entity_id},
+    )
+    await hass.async_block_till_done()
+    elapsed = time.perf_counter() - start
+    for panel in (HOME_ALARM_ENTITY_ID, TEMPLATE_ALARM_ENTITY_ID):
+        state = hass.states.get(panel)
+        assert state
+        assert state.state == expected_state
+    return elapsed
+
+
+def assert_renders(template_renders: TemplateRenders, entity_id: str) -> None:
+    """Check a transition stayed within the render budget of the proxy."""
+    if entity_id == TEMPLATE_ALARM_ENTITY_ID:
+        # An empty report would pass the budget without measuring anything
+        assert TEMPLATE_ALARM_ENTITY_ID in template_renders.entities
+    assert not template_renders.over_budget(
+        {TEMPLATE_ALARM_ENTITY_ID: PROXY_RENDER_BUDGET}
+    )
+
+
+async def test_template_control_panel_latency(
+    hass: HomeAssistant,
+    alarm_control_panel: Any,
+    template_renders: TemplateRenders,
+    error_caplog: pytest.LogCaptureFixture,
+) -> None:
+    """Compare arm and disarm latency through the proxy with the alarm itself."""
+    latencies: dict[str, dict[str, list[float]]] = {
+        entity_id: {"arm": [], "disarm": []}
+        for entity_id in (HOME_ALARM_ENTITY_ID, TEMPLATE_ALARM_ENTITY_ID)
+    }
+    for _ in range(ALARM_CYCLES):
+        for entity_id, panel_latencies in latencies.items():
+            template_renders.reset()
+            panel_latencies["arm"].append(
+                await alarm_transition(hass, entity_id, "alarm_arm_home", "armed_home")
+            )
+            assert_renders(template_renders, entity_id)
+            template_renders.reset()
+            # Only the alarm itself needs the code to disarm
+            panel_latencies["disarm"].append(
+                await alarm_transition(
+                    hass,
+                    entity_id,
+                    "alarm_disarm",
+                    "disarmed",
+                    {"code": SECRET_CODE}
+                    if entity_id == HOME_ALARM_ENTITY_ID
+                    else None,
+                )
+            )
+            assert_renders(template_renders, entity_id)
+
+    for transition in ("arm", "disarm"):
+        direct = statistics.median(latencies[HOME_ALARM_ENTITY_ID][transition])
+        proxy = statistics.median(latencies[TEMPLATE_ALARM_ENTITY_ID][transition])
+        _LOGGER.info(
+            "Median %s latency: direct=%.2fms proxy=%.2fms",
+            transition,
+            direct * 1000,
+            proxy * 1000,
+        )
+        assert proxy - direct <= PROXY_LATENCY_BUDGET
+
+    assert not error_caplog.records
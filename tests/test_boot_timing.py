@@ -0,0 +1,206 @@
+"""Boot the whole configuration offline and report where startup time goes.
+
+Run with `script/server --boot-timing`. Every file in `config/` is loaded
+and set up the way Home Assistant boots, with local stand-ins for the
+integrations that need the network or real devices:
+
+- Nest and the mobile app are devices in the device registry, and the nest
+  event entity is a plain state
+- Discord is a mocked `notify.discord` service
+- The weather provider is the demo weather platform
+- Calendars are local calendars kept in memory
+
+The report lists the setup time of each integration, the parse time of each
+file during boot, and the time until Home Assistant has started. Validation
+happens inside integration setup and can not be split by file, so each file is
+validated again on its own after boot. Those times are reported separately and
+are not part of the time to ready.
+"""
+
+import asyncio
+import logging
+import pathlib
+import shutil
+import time
+from typing import Any
+from unittest.mock import patch
+
+import pytest
+import yaml
+from homeassistant import config as conf_util
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.const import Platform
+from homeassistant.core import CoreState, HomeAssistant
+from homeassistant.helpers import device_registry as dr
+from homeassistant.loader import async_get_integration
+from homeassistant.setup import async_get_setup_timings, async_setup_component
+from homeassistant.util.yaml import Secrets, load_yaml
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_mock_service,
+)
+
+from tests.yaml_loader import SECRETS
+
+_LOGGER = logging.getLogger(__name__)
+
+CONFIG_DIR = pathlib.Path("config")
+
+# Files in these directories are lists (or named items) for the domain
+DOMAIN_DIRS = {
+    "automations": "automation",
+    "intent_scripts": "intent_script",
+    "templates": "template",
+}
+CALENDARS = ["personal"]
+NEST_EVENT_ENTITY_ID = "event.front_door_chime"
+STAND_INS = {
+    "weather.woodgreen": "weather.demo_weather_north",
+    "NEST_EVENT_ENTITY_ID": NEST_EVENT_ENTITY_ID,
+}
+
+
+@pytest.fixture(name="config_dir")
+def mock_config_dir(hass: HomeAssistant, tmp_path: pathlib.Path) -> pathlib.Path:
+    """Fixture for a copy of the configuration that points at the stand-ins."""
+    config_dir = tmp_path / "config"
+    shutil.copytree(hass.config.config_dir, config_dir)
+    (config_dir / "secrets.yaml").write_text(yaml.safe_dump(SECRETS))
+    hass.config.config_dir = str(config_dir)
+
+    device_registry = dr.async_get(hass)
+    replacements = dict(STAND_INS)
+    for domain, placeholder in (
+        ("nest", "NEST_DEVICE_ID"),
+        ("mobile_app", "MOBILE_APP_DEVICE_ID"),
+    ):
+        config_entry = MockConfigEntry(domain=domain)
+        config_entry.add_to_hass(hass)
+        device = device_registry.async_get_or_create(
+            config_entry_id=config_entry.entry_id,
+            identifiers={(domain, f"{domain}-stand-in")},
+        )
+        replacements[placeholder] = device.id
+    for directory in DOMAIN_DIRS:
+        for path in (config_dir / directory).glob("*.yaml"):
+            content = path.read_text()
+            for old, new in replacements.items():
+                content = content.replace(old, new)
+            path.write_text(content)
+    return config_dir
+
+
+async def async_setup_stand_ins(hass: HomeAssistant) -> None:
+    """Set up local stand-ins for the integrations that need the network."""
+    hass.states.async_set(NEST_EVENT_ENTITY_ID, "unknown")
+    async_mock_service(hass, "notify", "discord")
+
+    config_entries = [
+        MockConfigEntry(domain="local_calendar", data={"calendar_name": name})
+        for name in CALENDARS
+    ]
+    config_entries.append(MockConfigEntry(domain="demo"))
+    for config_entry in config_entries:
+        config_entry.add_to_hass(hass)
+    with patch(
+        "homeassistant.components.demo.COMPONENTS_WITH_CONFIG_ENTRY_DEMO_PLATFORM",
+        [Platform.WEATHER],
+    ):
+        await asyncio.gather(
+            *(
+                hass.config_entries.async_setup(config_entry.entry_id)
+                for config_entry in config_entries
+            )
+        )
+    for config_entry in config_entries:
+        assert config_entry.state == ConfigEntryState.LOADED
+
+
+def config_files(config_dir: pathlib.Path) -> list[tuple[str, str | None]]:
+    """Return each configuration file and the domain of a domain directory."""
+    return [
+        # Top level files are already keyed by their domain
+        *((path.name, None) for path in sorted(CONFIG_DIR.glob("*.yaml"))),
+        *(
+            (str(path.relative_to(config_dir)), domain)
+            for directory, domain in DOMAIN_DIRS.items()
+            for path in sorted((config_dir / directory).glob("*.yaml"))
+        ),
+    ]
+
+
+def report(title: str, timings: dict[str, float]) -> str:
+    """Return the timings sorted with the slowest first."""
+    width = max((len(name) for name in timings), default=0)
+    lines = [title]
+    lines.extend(
+        f"  {name:<{width}}  {elapsed * 1000:>9.2f}ms"
+        for name, elapsed in sorted(timings.items(), key=lambda item: -item[1])
+    )
+    return "\n".join(lines)
+
+
+@pytest.mark.parametrize(("expected_lingering_timers"), [True])
+async def test_boot_timing(
+    hass: HomeAssistant,
+    config_dir: pathlib.Path,
+    error_caplog: pytest.LogCaptureFixture,
+) -> None:
+    """Boot the configuration with stand-ins and report the setup times."""
+    secrets = Secrets(config_dir)
+    files = config_files(config_dir)
+    already_setup = set(hass.config.components)
+    hass.set_state(CoreState.not_running)
+
+    start = time.perf_counter()
+    await async_setup_stand_ins(hass)
+
+    parse: dict[str, float] = {}
+    config: dict[str, Any] = {}
+    contents: dict[str, Any] = {}
+    for config_file, domain in files:
+        file_start = time.perf_counter()
+        content = load_yaml(str(config_dir / config_file), secrets)
+        parse[config_file] = time.perf_counter() - file_start
+        contents[config_file] = content
+        if domain is None:
+            config.update(content)
+        elif isinstance(content, dict):
+            config.setdefault(domain, {}).update(content)
+        else:
+            config.setdefault(domain, []).extend(content)
+
+    domains = [domain for domain in config if domain not in already_setup]
+    results = await asyncio.gather(
+        *(async_setup_component(hass, domain, config) for domain in domains)
+    )
+    assert all(results)
+    await hass.async_start()
+    await hass.async_block_till_done()
+    ready = time.perf_counter() - start
+    assert hass.state is CoreState.running
+
+    # Validate each file on its own again, since setup validates them together
+    validate: dict[str, float] = {}
+    for config_file, domain in files:
+        content = contents[config_file]
+        file_config = content if domain is None else {domain: content}
+        integration = await async_get_integration(hass, domain or next(iter(content)))
+        file_start = time.perf_counter()
+        info = await conf_util.async_process_component_config(
+            hass, file_config, integration
+        )
+        validate[config_file] = time.perf_counter() - file_start
+        assert info.config is not None, config_file
+
+    integrations = {
+        domain: elapsed
+        for domain, elapsed in async_get_setup_timings(hass).items()
+        if domain not in already_setup
+    }
+    _LOGGER.info(report("Integration setup", integrations))
+    _LOGGER.info(report("File parse during boot", parse))
+    _LOGGER.info(report("File re-validation after boot (not in boot time)", validate))
+    _LOGGER.info("Time to ready: %.2fms", ready * 1000)
+
+    assert not error_caplog.records
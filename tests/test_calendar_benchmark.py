@@ -0,0 +1,95 @@
+"""Benchmarks for reading events from a busy local calendar."""
+
+import datetime
+import logging
+
+import pytest
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+from ical.event import Event
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+)
+
+from tests.fixtures.config_benchmark import ConfigBenchmark
+from tests.fixtures.local_calendar_fixture import (
+    CALENDAR_KEY,
+    CalendarStorage,
+    generate_events,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+CALENDAR_ENTITY = "calendar.personal"
+EVENT_COUNTS = [100, 1_000, 10_000]
+# Events are spread over this period, so larger calendars are busier
+CALENDAR_SPAN = datetime.timedelta(days=30)
+# Windows requested by the agenda intent script and the calendar location template
+GET_EVENTS_HOURS = [18, 168]
+SEEDED_EVENTS = 3
+
+
+@pytest.fixture(name="calendar_events")
+def mock_calendar_events() -> list[Event]:
+    """Fixture to seed the calendar with a few upcoming events."""
+    return generate_events(
+        SEEDED_EVENTS,
+        dt_util.now() + datetime.timedelta(hours=1),
+        datetime.timedelta(hours=2),
+    )
+
+
+async def test_seeded_events(hass: HomeAssistant, calendar: MockConfigEntry) -> None:
+    """Test events seeded before setup are returned by the calendar."""
+    response = await hass.services.async_call(
+        "calendar",
+        "get_events",
+        {"entity_id": CALENDAR_ENTITY, "duration": {"hours": 18}},
+        blocking=True,
+        return_response=True,
+    )
+    assert response
+    assert [event["summary"] for event in response[CALENDAR_ENTITY]["events"]] == [
+        f"Event {i}" for i in range(SEEDED_EVENTS)
+    ]
+
+
+@pytest.mark.parametrize("event_count", EVENT_COUNTS)
+async def test_get_events_benchmark(
+    hass: HomeAssistant,
+    store: CalendarStorage,
+    config_benchmark: ConfigBenchmark,
+    event_count: int,
+) -> None:
+    """Time loading a seeded calendar and fetching events from it."""
+    store.seed_events(
+        CALENDAR_KEY,
+        generate_events(event_count, dt_util.now(), CALENDAR_SPAN / event_count),
+    )
+    name = f"calendar.get_events[{event_count}]"
+
+    config_entry = MockConfigEntry(
+        domain="local_calendar", data={"calendar_name": CALENDAR_KEY}
+    )
+    config_entry.add_to_hass(hass)
+    with config_benchmark.measure(name, "setup"):
+        await hass.config_entries.async_setup(config_entry.entry_id)
+        await hass.async_block_till_done()
+    assert config_entry.state == ConfigEntryState.LOADED
+
+    for hours in GET_EVENTS_HOURS:
+        with config_benchmark.measure(name, f"get_events_{hours}h"):
+            response = await hass.services.async_call(
+                "calendar",
+                "get_events",
+                {"entity_id": CALENDAR_ENTITY, "duration": {"hours": hours}},
+                blocking=True,
+                return_response=True,
+            )
+        assert response
+        events = response[CALENDAR_ENTITY]["events"]
+        assert 0 < len(events) <= event_count
+
+    _LOGGER.info("%s: %s", name, config_benchmark.results[name])
+    config_benchmark.check(name)
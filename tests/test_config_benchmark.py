@@ -0,0 +1,82 @@
+"""Benchmarks for parsing, validating and setting up each configuration file."""
+
+import logging
+import pathlib
+
+import pytest
+import yaml
+from homeassistant import config as conf_util
+from homeassistant.core import HomeAssistant
+from homeassistant.loader import async_get_integration
+from homeassistant.setup import async_setup_component
+from homeassistant.util.yaml import Secrets, load_yaml
+
+from tests.fixtures.config_benchmark import ConfigBenchmark
+from tests.yaml_loader import SECRETS
+
+_LOGGER = logging.getLogger(__name__)
+
+
+CONFIG_DIR = pathlib.Path("config")
+
+# Files in these directories are lists of items for the domain
+DOMAIN_DIRS = {
+    "templates": "template",
+    "intent_scripts": "intent_script",
+    # Validating automations also loads and substitutes their blueprints
+    "automations": "automation",
+}
+CONFIG_FILES = [
+    # Top level files are already keyed by their domain
+    *((path.name, None) for path in sorted(CONFIG_DIR.glob("*.yaml"))),
+    *(
+        (str(path.relative_to(CONFIG_DIR)), domain)
+        for directory, domain in DOMAIN_DIRS.items()
+        for path in sorted((CONFIG_DIR / directory).glob("*.yaml"))
+    ),
+]
+
+
+@pytest.fixture(name="secrets")
+def mock_secrets(hass: HomeAssistant) -> Secrets:
+    """Fixture to provide secrets referenced by the configuration files."""
+    config_dir = pathlib.Path(hass.config.config_dir)
+    (config_dir / "secrets.yaml").write_text(yaml.safe_dump(SECRETS))
+    return Secrets(config_dir)
+
+
+@pytest.mark.parametrize(("expected_lingering_timers"), [True])
+@pytest.mark.parametrize(("config_file", "domain"), CONFIG_FILES)
+async def test_config_setup_benchmark(
+    hass: HomeAssistant,
+    secrets: Secrets,
+    config_benchmark: ConfigBenchmark,
+    config_file: str,
+    domain: str | None,
+) -> None:
+    """Time parse, validation and setup of a config file against the baseline."""
+    with config_benchmark.measure(config_file, "parse"):
+        content = load_yaml(hass.config.path(config_file), secrets)
+    assert content
+
+    # Files without a domain directory are already keyed by domain
+    if domain is None:
+        config = content
+        domain = next(iter(config))
+    else:
+        config = {domain: content}
+
+    integration = await async_get_integration(hass, domain)
+    for dependency in integration.dependencies:
+        assert await async_setup_component(hass, dependency, {})
+
+    with config_benchmark.measure(config_file, "validate"):
+        info = await conf_util.async_process_component_config(hass, config, integration)
+    assert info.config is not None
+
+    with config_benchmark.measure(config_file, "setup"):
+        assert await async_setup_component(hass, domain, config)
+        await hass.async_block_till_done()
+
+    _LOGGER.info("%s: %s", config_file, config_benchmark.results[config_file])
+    config_benchmark.check(config_file)
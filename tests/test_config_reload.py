@@ -0,0 +1,231 @@
+"""Benchmarks for reloading the configuration after editing a single file.
+
+Reload times are logged, and compared with a baseline recorded on the same
+machine when running with `--check-benchmarks`.
+"""
+
+import logging
+import pathlib
+import shutil
+from typing import Any
+
+import pytest
+import yaml
+from homeassistant import config as conf_util
+from homeassistant.components.automation import DATA_COMPONENT
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers import intent
+from homeassistant.helpers.entity import Entity
+from homeassistant.helpers.entity_platform import async_get_platforms
+from homeassistant.setup import async_setup_component
+
+from tests.fixtures.config_benchmark import ConfigBenchmark
+from tests.yaml_loader import SECRETS, load_config
+
+_LOGGER = logging.getLogger(__name__)
+
+# The live configuration includes every file in these directories
+CONFIGURATION_YAML = """
+automation: !include_dir_merge_list automations
+template: !include_dir_merge_list templates
+intent_script: !include_dir_merge_named intent_scripts
+"""
+DOMAINS = ("automation", "template", "intent_script")
+
+
+@pytest.fixture(name="config_dir")
+def mock_config_dir(hass: HomeAssistant, tmp_path: pathlib.Path) -> pathlib.Path:
+    """Fixture for a configuration directory that the test may edit."""
+    config_dir = tmp_path / "config"
+    shutil.copytree(hass.config.config_dir, config_dir)
+    (config_dir / "configuration.yaml").write_text(CONFIGURATION_YAML)
+    (config_dir / "secrets.yaml").write_text(yaml.safe_dump(SECRETS))
+    hass.config.config_dir = str(config_dir)
+    return config_dir
+
+
+@pytest.fixture(name="full_config")
+async def mock_full_config(hass: HomeAssistant, config_dir: pathlib.Path) -> None:
+    """Fixture to set up the automations, templates and intent scripts."""
+    config = await conf_util.async_hass_config_yaml(hass)
+    for domain in DOMAINS:
+        assert await async_setup_component(hass, domain, config)
+    await hass.async_block_till_done()
+
+
+def edit_file(path: pathlib.Path, old: str, new: str) -> None:
+    """Replace text in a configuration file."""
+    content = path.read_text()
+    assert old in content
+    path.write_text(content.replace(old, new))
+
+
+def unique_ids(path: pathlib.Path) -> set[str]:
+    """Return the unique ids of the automations or template entities in a file."""
+    ids: set[str] = set()
+    for block in load_config(path):
+        if "id" in block:
+            ids.add(block["id"])
+        for value in block.values():
+            if isinstance(value, list):
+                ids.update(
+                    item["unique_id"]
+                    for item in value
+                    if isinstance(item, dict) and "unique_id" in item
+                )
+    return ids
+
+
+def entity_ids(hass: HomeAssistant, platform: str, path: pathlib.Path) -> set[str]:
+    """Return the ids of the entities created from a configuration file."""
+    ids = unique_ids(path)
+    # Trigger template entities prefix their unique id with the block unique id
+    return {
+        entry.entity_id
+        for entry in er.async_get(hass).entities.values()
+        if entry.platform == platform
+        and (
+            entry.unique_id in ids
+            or any(entry.unique_id.endswith(f"-{unique_id}") for unique_id in ids)
+        )
+    }
+
+
+def template_entities(hass: HomeAssistant) -> dict[str, Entity]:
+    """Return the template entities by entity id."""
+    return {
+        entity_id: entity
+        for platform in async_get_platforms(hass, "template")
+        for entity_id, entity in platform.entities.items()
+    }
+
+
+def automation_entities(hass: HomeAssistant) -> dict[str, Entity]:
+    """Return the automation entities by entity id."""
+    return {entity.entity_id: entity for entity in hass.data[DATA_COMPONENT].entities}
+
+
+def rebuilt(before: dict[str, Entity], after: dict[str, Entity]) -> set[str]:
+    """Return the entities that were replaced or added by the reload."""
+    return {
+        entity_id
+        for entity_id, entity in after.items()
+        if before.get(entity_id) is not entity
+    }
+
+
+async def reload(
+    hass: HomeAssistant, config_benchmark: ConfigBenchmark, domain: str, name: str
+) -> None:
+    """Reload a domain and record the time to compare with the baseline."""
+    with config_benchmark.measure(f"reload {name}", "reload"):
+        await hass.services.async_call(domain, "reload", blocking=True)
+        await hass.async_block_till_done()
+    _LOGGER.info("%s: %s", name, config_benchmark.results[f"reload {name}"])
+
+
+@pytest.mark.parametrize(("expected_lingering_timers"), [True])
+async def test_automation_reload(
+    hass: HomeAssistant,
+    config_dir: pathlib.Path,
+    full_config: Any,
+    config_benchmark: ConfigBenchmark,
+    error_caplog: pytest.LogCaptureFixture,
+) -> None:
+    """Edit one automation file and verify only its automations are rebuilt."""
+    config_file = "automations/notify_conversation.yaml"
+    changed = entity_ids(hass, "automation", config_dir / config_file)
+    assert changed
+    before = automation_entities(hass)
+    assert len(before) > len(changed)
+
+    edit_file(
+        config_dir / config_file, 'description: ""', 'description: "Edited in test"'
+    )
+    await reload(hass, config_benchmark, "automation", config_file)
+
+    after = automation_entities(hass)
+    assert after.keys() == before.keys()
+    assert rebuilt(before, after) == changed
+    config_benchmark.check(f"reload {config_file}")
+
+    assert not error_caplog.records
+
+
+@pytest.mark.parametrize(("expected_lingering_timers"), [True])
+async def test_template_reload(
+    hass: HomeAssistant,
+    config_dir: pathlib.Path,
+    full_config: Any,
+    config_benchmark: ConfigBenchmark,
+    error_caplog: pytest.LogCaptureFixture,
+) -> None:
+    """Edit one template file and verify the other templates keep their state."""
+    # Give a trigger template a state that only its trigger can set
+    hass.bus.async_fire(
+        "intent_script_response",
+        {
+            "intent": "GetWeatherForecast",
+            "response": {"condition": "sunny", "temperature": 20, "precipitation": 0},
+        },
+    )
+    await hass.async_block_till_done()
+    state = hass.states.get("sensor.intent_script_cache")
+    assert state
+    assert "GetWeatherForecast" in state.attributes["responses"]
+
+    config_file = "templates/safe_alarm.yaml"
+    changed = entity_ids(hass, "template", config_dir / config_file)
+    assert changed
+    before = template_entities(hass)
+    unchanged = before.keys() - changed
+    assert unchanged
+    states = {entity_id: hass.states.get(entity_id) for entity_id in unchanged}
+
+    edit_file(config_dir / config_file, "name: Safe Alarm", "name: Safe Alarm Edited")
+    await reload(hass, config_benchmark, "template", config_file)
+
+    after = template_entities(hass)
+    assert after.keys() == before.keys()
+    # Template reloads rebuild every entity, not only those in the edited file
+    _LOGGER.info("Rebuilt %d of %d entities", len(rebuilt(before, after)), len(after))
+    for entity_id, old_state in states.items():
+        new_state = hass.states.get(entity_id)
+        assert new_state
+        assert old_state
+        assert new_state.state == old_state.state, entity_id
+        assert new_state.attributes == old_state.attributes, entity_id
+    for entity_id in changed:
+        state = hass.states.get(entity_id)
+        assert state
+        assert state.name == "Safe Alarm Edited"
+    config_benchmark.check(f"reload {config_file}")
+
+    assert not error_caplog.records
+
+
+@pytest.mark.parametrize(("expected_lingering_timers"), [True])
+async def test_intent_script_reload(
+    hass: HomeAssistant,
+    config_dir: pathlib.Path,
+    full_config: Any,
+    config_benchmark: ConfigBenchmark,
+    error_caplog: pytest.LogCaptureFixture,
+) -> None:
+    """Edit one intent script file and verify every intent is still handled."""
+    intents = {handler.intent_type for handler in intent.async_get(hass)}
+    assert {"GetTodaysAgenda", "GetWeatherForecast"} <= intents
+
+    config_file = "intent_scripts/weather_forecast.yaml"
+    edit_file(
+        config_dir / config_file,
+        "description: Return the current weather forecast",
+        "description: Return the current weather forecast and conditions",
+    )
+    await reload(hass, config_benchmark, "intent_script", config_file)
+
+    assert {handler.intent_type for handler in intent.async_get(hass)} == intents
+    config_benchmark.check(f"reload {config_file}")
+
+    assert not error_caplog.records
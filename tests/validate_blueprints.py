@@ -0,0 +1,251 @@
+"""Validate every automation blueprint and blueprint-backed automation offline.
+
+Run with `script/validate_blueprints`, which pre-commit runs when a blueprint
+or automation changes. Each blueprint is loaded with Home Assistant's
+blueprint schema, and each `use_blueprint` automation has its inputs checked
+against the blueprint selectors, substituted, and validated with the
+automation schema. Blueprints that no automation uses are substituted with
+sample inputs built from their selectors.
+
+Files are validated in parallel across processes. Results are cached by a
+hash of the file contents (and the blueprints for automations), so files that
+have not changed since they last passed are skipped.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import pathlib
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from importlib import metadata
+from typing import Any
+
+CONFIG_DIR = pathlib.Path(__file__).parent.parent / "config"
+CACHE_FILE = pathlib.Path(__file__).parent.parent / ".validate_blueprints.json"
+BLUEPRINT_DIR = pathlib.Path("blueprints/automation")
+AUTOMATION_DIR = pathlib.Path("automations")
+
+# Device and entity ids kept out of the published automations
+PLACEHOLDERS = {
+    "NEST_EVENT_ENTITY_ID": "event.front_door_chime",
+    "NEST_DEVICE_ID": "nest-device-id",
+    "MOBILE_APP_DEVICE_ID": "mobile-app-device-id",
+}
+SAMPLE_ID = "blueprint_validation"
+
+
+@dataclass
+class ValidationResult:
+    """Files validated or skipped, and the errors of each invalid file."""
+
+    validated: list[str] = field(default_factory=list)
+    skipped: list[str] = field(default_factory=list)
+    errors: dict[str, list[str]] = field(default_factory=dict)
+
+
+def find_files(config_dir: pathlib.Path) -> list[pathlib.Path]:
+    """Return the blueprints and automation files relative to the config dir."""
+    return [
+        path.relative_to(config_dir)
+        for directory in (BLUEPRINT_DIR, AUTOMATION_DIR)
+        for path in sorted((config_dir / directory).rglob("*.yaml"))
+    ]
+
+
+def content_hash(config_dir: pathlib.Path, path: pathlib.Path) -> str:
+    """Return the hash of everything the validation of a file depends on."""
+    digest = hashlib.sha256(metadata.version("homeassistant").encode())
+    dependencies = [path]
+    if path.is_relative_to(AUTOMATION_DIR):
+        # Automations are substituted into their blueprints
+        dependencies.extend(
+            blueprint.relative_to(config_dir)
+            for blueprint in sorted((config_dir / BLUEPRINT_DIR).rglob("*.yaml"))
+        )
+    for dependency in dependencies:
+        digest.update(str(dependency).encode())
+        digest.update((config_dir / dependency).read_bytes())
+    return digest.hexdigest()
+
+
+def sample_input(selector: dict[str, Any] | None) -> Any:
+    """Return an input value accepted by the selector."""
+    kind, options = next(iter((selector or {"text": None}).items()))
+    options = options or {}
+    if kind in ("entity", "target"):
+        entity = options.get("entity", {}) if kind == "target" else options
+        entity = entity[0] if isinstance(entity, list) else entity
+        entity = (entity.get("filter") or [entity])[0]
+        domain = entity.get("domain") or "sensor"
+        entity_id = f"{domain[0] if isinstance(domain, list) else domain}.{SAMPLE_ID}"
+        if kind == "target":
+            return {"entity_id": entity_id}
+        return [entity_id] if options.get("multiple") else entity_id
+    if kind == "select":
+        option = options["options"][0]
+        return option["value"] if isinstance(option, dict) else option
+    samples = {
+        "boolean": False,
+        "duration": {"hours": 1},
+        "number": options.get("min", 0),
+        "object": {},
+        "time": "08:00:00",
+    }
+    return samples.get(kind, SAMPLE_ID)
+
+
+def _validate_automation(blueprint: Any, config: dict[str, Any]) -> None:
+    """Check the inputs, substitute them and validate the automation."""
+    # Imported here so skipped runs do not pay for importing Home Assistant
+    from homeassistant.components.automation.config import PLATFORM_SCHEMA
+    from homeassistant.components.blueprint.models import BlueprintInputs
+    from homeassistant.helpers import selector
+
+    inputs = BlueprintInputs(blueprint, config)
+    inputs.validate()
+    for name, value in inputs.inputs.items():
+        if name not in blueprint.inputs:
+            raise ValueError(f"Unknown input {name}")
+        if blueprint_selector := (blueprint.inputs[name] or {}).get("selector"):
+            selector.selector(blueprint_selector)(value)
+    PLATFORM_SCHEMA(inputs.async_substitute())
+
+
+def _load_blueprint(config_dir: pathlib.Path, path: str) -> Any:
+    """Load a blueprint with Home Assistant's automation blueprint schema."""
+    from homeassistant.components.automation.config import (
+        AUTOMATION_BLUEPRINT_SCHEMA,
+    )
+    from homeassistant.components.blueprint.models import Blueprint
+    from homeassistant.util.yaml import load_yaml_dict
+
+    blueprint = Blueprint(
+        load_yaml_dict(config_dir / BLUEPRINT_DIR / path),
+        path=path,
+        expected_domain="automation",
+        schema=AUTOMATION_BLUEPRINT_SCHEMA,
+    )
+    if errors := blueprint.validate():
+        raise ValueError(", ".join(errors))
+    return blueprint
+
+
+def validate_file(config_dir: pathlib.Path, path: pathlib.Path) -> list[str]:
+    """Validate a blueprint or automation file and return its errors."""
+    import voluptuous as vol
+    from homeassistant.exceptions import HomeAssistantError
+    from homeassistant.util.yaml import load_yaml
+
+    invalid = (HomeAssistantError, vol.Invalid, ValueError)
+
+    errors: list[str] = []
+    if path.is_relative_to(BLUEPRINT_DIR):
+        blueprint_path = str(path.relative_to(BLUEPRINT_DIR))
+        try:
+            blueprint = _load_blueprint(config_dir, blueprint_path)
+            inputs = {
+                name: sample_input((blueprint_input or {}).get("selector"))
+                for name, blueprint_input in blueprint.inputs.items()
+                if "default" not in (blueprint_input or {})
+            }
+            _validate_automation(
+                blueprint, {"use_blueprint": {"path": blueprint_path, "input": inputs}}
+            )
+        except invalid as err:
+            errors.append(f"{path}: {err}")
+        return errors
+
+    try:
+        configs = load_yaml(config_dir / path) or []
+    except invalid as err:
+        return [f"{path}: {err}"]
+    for config in configs:
+        if "use_blueprint" not in config:
+            continue
+        name = config.get("alias", config.get("id"))
+        use_blueprint = config["use_blueprint"]
+        use_blueprint["input"] = {
+            key: PLACEHOLDERS.get(value, value) if isinstance(value, str) else value
+            for key, value in (use_blueprint.get("input") or {}).items()
+        }
+        try:
+            blueprint = _load_blueprint(config_dir, use_blueprint["path"])
+            _validate_automation(blueprint, config)
+        except invalid as err:
+            errors.append(f"{path} ({name}): {err}")
+    return errors
+
+
+def validate(
+    config_dir: pathlib.Path = CONFIG_DIR,
+    cache_file: pathlib.Path | None = CACHE_FILE,
+    workers: int | None = None,
+) -> ValidationResult:
+    """Validate the files changed since they last passed."""
+    cache: dict[str, str] = {}
+    if cache_file is not None and cache_file.exists():
+        cache = json.loads(cache_file.read_text())
+
+    result = ValidationResult()
+    hashes: dict[pathlib.Path, str] = {}
+    for path in find_files(config_dir):
+        hashes[path] = content_hash(config_dir, path)
+        if cache.get(str(path)) == hashes[path]:
+            result.skipped.append(str(path))
+    pending = [path for path in hashes if str(path) not in result.skipped]
+
+    if pending:
+        with ProcessPoolExecutor(
+            max_workers=min(len(pending), workers or os.cpu_count() or 1)
+        ) as executor:
+            for path, errors in zip(
+                pending,
+                executor.map(validate_file, [config_dir] * len(pending), pending),
+                strict=True,
+            ):
+                result.validated.append(str(path))
+                if errors:
+                    result.errors[str(path)] = errors
+                else:
+                    cache[str(path)] = hashes[path]
+
+    if cache_file is not None:
+        # Forget files that were removed or failed
+        cache = {
+            str(path): hashes[path]
+            for path in hashes
+            if cache.get(str(path)) == hashes[path]
+        }
+        cache_file.write_text(json.dumps(cache, indent=2, sort_keys=True) + "\n")
+    return result
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Validate the blueprints and print the errors."""
+    parser = argparse.ArgumentParser(
+        description="Validate the automation blueprints and their automations."
+    )
+    parser.add_argument(
+        "--no-cache", action="store_true", help="Validate every file again."
+    )
+    parser.add_argument("--workers", type=int, help="Number of processes to use.")
+    args = parser.parse_args(argv)
+
+    result = validate(
+        cache_file=None if args.no_cache else CACHE_FILE, workers=args.workers
+    )
+    for errors in result.errors.values():
+        for error in errors:
+            print(error, file=sys.stderr)
+    print(
+        f"Validated {len(result.validated)} files, skipped {len(result.skipped)} "
+        f"unchanged, {len(result.errors)} invalid"
+    )
+    return 1 if result.errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
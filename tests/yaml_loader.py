@@ -0,0 +1,72 @@
+"""Shared YAML loader for the configuration files under test.
+
+Configuration files are parsed with the libyaml C loader when available and
+memoized by path and modification time, so each file is parsed once per
+session no matter how many tests use it. `!secret` tags are resolved from
+`SECRETS` and blueprint `!input` tags are loaded as Home Assistant `Input`
+objects, the same as Home Assistant's own loader.
+"""
+
+import copy
+import functools
+import pathlib
+from collections.abc import Mapping
+from typing import Any
+
+import yaml
+from homeassistant.util.yaml import Input
+
+SECRETS = {
+    "alarm_code": "1234",
+}
+
+_BaseLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+class ConfigLoader(_BaseLoader):  # type: ignore[misc,valid-type]
+    """Safe loader that understands the Home Assistant tags used in config."""
+
+
+def _secret(loader: ConfigLoader, node: yaml.Node) -> Any:
+    """Resolve a `!secret` tag from the test secrets."""
+    name = loader.construct_scalar(node)  # type: ignore[arg-type]
+    if name not in SECRETS:
+        raise yaml.constructor.ConstructorError(
+            None, None, f"Secret {name} not defined", node.start_mark
+        )
+    return SECRETS[name]
+
+
+def _input(loader: ConfigLoader, node: yaml.Node) -> Input:
+    """Load a blueprint `!input` tag."""
+    return Input(loader.construct_scalar(node))  # type: ignore[arg-type]
+
+
+ConfigLoader.add_constructor("!secret", _secret)
+ConfigLoader.add_constructor("!input", _input)
+
+
+@functools.cache
+def _load(
+    path: pathlib.Path, mtime_ns: int, replacements: tuple[tuple[str, str], ...]
+) -> Any:
+    """Parse a file, cached by the arguments."""
+    content = path.read_text()
+    for old, new in replacements:
+        content = content.replace(old, new)
+    return yaml.load(content, Loader=ConfigLoader)
+
+
+def load_config(
+    path: pathlib.Path, replacements: Mapping[str, str] | None = None
+) -> Any:
+    """Load a YAML configuration file.
+
+    The `replacements` are applied to the file contents before parsing, which
+    tests use to point the configuration at test entities and devices. The
+    result is a copy, so callers are free to modify it.
+    """
+    path = path.resolve()
+    return copy.deepcopy(
+        _load(path, path.stat().st_mtime_ns, tuple((replacements or {}).items()))
+    )